@@ -167,15 +167,29 @@
 import json
 import os
 from abc import ABC
+from functools import lru_cache
 from typing import Optional, Type
 
 from dotenv import load_dotenv
 from groq import Groq
 from pydantic import BaseModel
 
+from app.config import HTTP_MAX_RETRIES
+from app.http_client import get_httpx_client
+
 load_dotenv()
 
 
+@lru_cache(maxsize=1)
+def get_groq_client() -> Groq:
+    """One Groq client per process, riding the shared pooled httpx transport."""
+    return Groq(
+        api_key=os.getenv("GROQ_API_KEY"),
+        http_client=get_httpx_client(),
+        max_retries=HTTP_MAX_RETRIES,
+    )
+
+
 class BaseAgent(ABC):
     """
     Base class that now uses ONLY Groq for structured JSON output.
@@ -185,9 +199,9 @@ class BaseAgent(ABC):
         self.model = model
 
         # -------------------------------
-        # Groq Client
+        # Groq Client (shared, keep-alive)
         # -------------------------------
-        self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.groq_client = get_groq_client()
 
     # ----------------------------------------------------
     # Helpers
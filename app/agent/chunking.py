@@ -0,0 +1,74 @@
+"""Token-approximate text chunking for map-reduce summarization."""
+
+import re
+from typing import List
+
+# Llama/GPT-style tokenizers average about four characters of English per token.
+CHARS_PER_TOKEN = 4
+_SEGMENT_PATTERN = re.compile(r"\n\s*\n|(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; good enough for sizing prompts, not for billing."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_words(segment: str, max_tokens: int) -> List[str]:
+    """Fallback for a single sentence longer than a chunk (e.g. unpunctuated transcripts)."""
+    pieces, current, size = [], [], 0
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    words = [
+        word[i:i + max_chars] for word in segment.split() for i in range(0, len(word), max_chars)
+    ]
+    for word in words:
+        word_tokens = estimate_tokens(word) + 1
+        if current and size + word_tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, size = [], 0
+        current.append(word)
+        size += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Split text into chunks of at most ~max_tokens, breaking at paragraph or
+    sentence boundaries where possible. Each chunk after the first repeats
+    up to `overlap_tokens` of trailing sentences from the previous chunk so
+    ideas straddling a boundary keep their context.
+    """
+    segments = []
+    for segment in _SEGMENT_PATTERN.split(text):
+        segment = segment.strip()
+        if not segment:
+            continue
+        if estimate_tokens(segment) > max_tokens:
+            segments.extend(_split_words(segment, max_tokens))
+        else:
+            segments.append(segment)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for segment in segments:
+        segment_tokens = estimate_tokens(segment) + 1
+        if current and size + segment_tokens > max_tokens:
+            chunks.append(" ".join(current))
+            # Carry the tail of this chunk into the next one.
+            carried, carried_size = [], 0
+            for previous in reversed(current):
+                previous_tokens = estimate_tokens(previous) + 1
+                if carried_size + previous_tokens > overlap_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_size += previous_tokens
+            if carried_size + segment_tokens > max_tokens:
+                carried, carried_size = [], 0
+            current, size = carried, carried_size
+        current.append(segment)
+        size += segment_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
@@ -1,8 +1,23 @@
 """Agent that turns raw content into concise digests."""
 
-from typing import Optional
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from pydantic import BaseModel
+from app.config import (
+    DIGEST_DIRECT_MAX_TOKENS,
+    DIGEST_CHUNK_TOKENS,
+    DIGEST_CHUNK_OVERLAP_TOKENS,
+    DIGEST_MAX_CHUNKS,
+    DIGEST_MAP_WORKERS,
+    DIGEST_CHUNK_CACHE_ENABLED,
+)
+from app.storage import state_path, hashed_name, read_json, write_json_atomic
 from .base import BaseAgent
+from .chunking import chunk_text, estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 PROMPT = """You are an expert AI news analyst specializing in summarizing technical articles, research papers, and video content about artificial intelligence.
 
@@ -15,6 +30,18 @@ Guidelines:
 - Use clear, accessible language while maintaining technical accuracy
 - Avoid marketing fluff - focus on substance"""
 
+CHUNK_PROMPT = """You are an expert AI news analyst. You will receive one part of a longer article or video transcript about artificial intelligence.
+
+Summarize only this part in 3-5 sentences:
+- Keep concrete facts: names, numbers, results, announcements and claims
+- Skip greetings, sponsor reads, filler and repetition
+- Do not speculate about the parts you have not seen"""
+
+# Bump when the chunk prompt or schema changes so cached summaries are not reused.
+CHUNK_PROMPT_VERSION = "1"
+# Rounds of summary-of-summaries before the final reduce is forced.
+MAX_REDUCE_ROUNDS = 3
+
 
 class DigestOutput(BaseModel):
     """Pydantic schema for the summary returned by the model."""
@@ -23,6 +50,12 @@ class DigestOutput(BaseModel):
     summary: str
 
 
+class ChunkSummary(BaseModel):
+    """Intermediate summary of one chunk of long content."""
+
+    summary: str
+
+
 class DigestAgent(BaseAgent):
     def __init__(self):
         # Using Groq's llama-3.3-70b-versatile model for digest generation
@@ -31,9 +64,22 @@ class DigestAgent(BaseAgent):
         self.system_prompt = PROMPT
 
     def generate_digest(self, title: str, content: str, article_type: str) -> Optional[DigestOutput]:
-        """Summarize an item into a digest using the configured LLM."""
+        """Summarize an item into a digest using the configured LLM.
+
+        Content longer than DIGEST_DIRECT_MAX_TOKENS is summarized map-reduce
+        style: chunks are summarized concurrently, then combined into the digest.
+        """
         try:
-            user_prompt = f"Create a digest for this {article_type}:\nTitle: {title}\nContent: {content[:8000]}"
+            if estimate_tokens(content) > DIGEST_DIRECT_MAX_TOKENS:
+                content = self._summarize_long_content(title, content, article_type)
+                if content is None:
+                    return None
+                user_prompt = (
+                    f"Create a digest for this {article_type} from the summaries of its parts, in order:\n"
+                    f"Title: {title}\nContent: {content}"
+                )
+            else:
+                user_prompt = f"Create a digest for this {article_type}:\nTitle: {title}\nContent: {content}"
 
             return self.generate_structured_output(
                 instructions=self.system_prompt,
@@ -45,3 +91,66 @@ class DigestAgent(BaseAgent):
             print(f"Error generating digest: {e}")
             return None
 
+    def _summarize_long_content(self, title: str, content: str, article_type: str) -> Optional[str]:
+        """Map step (plus intermediate reduces): condensed text for the final digest call."""
+        chunks = chunk_text(content, DIGEST_CHUNK_TOKENS, DIGEST_CHUNK_OVERLAP_TOKENS)
+        if len(chunks) > DIGEST_MAX_CHUNKS:
+            logger.warning(
+                f"'{title}' split into {len(chunks)} chunks, summarizing the first {DIGEST_MAX_CHUNKS}"
+            )
+            chunks = chunks[:DIGEST_MAX_CHUNKS]
+
+        for _ in range(MAX_REDUCE_ROUNDS):
+            partials = self._summarize_chunks(title, chunks, article_type)
+            if partials is None:
+                return None
+            combined = "\n\n".join(f"Part {i}: {p}" for i, p in enumerate(partials, 1))
+            if estimate_tokens(combined) <= DIGEST_CHUNK_TOKENS or len(partials) == 1:
+                return combined
+            # Too many partial summaries for one prompt: summarize them again.
+            chunks = chunk_text("\n\n".join(partials), DIGEST_CHUNK_TOKENS)
+        return combined
+
+    def _summarize_chunks(
+        self, title: str, chunks: List[str], article_type: str
+    ) -> Optional[List[str]]:
+        """Summarize chunks concurrently; None if any chunk fails (cached ones are kept)."""
+        total = len(chunks)
+
+        def summarize(indexed_chunk) -> Optional[str]:
+            index, chunk = indexed_chunk
+            return self._summarize_chunk(title, chunk, article_type, index, total)
+
+        workers = max(1, min(DIGEST_MAP_WORKERS, total))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(summarize, enumerate(chunks, 1)))
+        if any(p is None for p in partials):
+            logger.warning(f"{partials.count(None)}/{total} chunk summaries failed for '{title}'")
+            return None
+        return partials
+
+    def _summarize_chunk(
+        self, title: str, chunk: str, article_type: str, index: int, total: int
+    ) -> Optional[str]:
+        cache_path = None
+        if DIGEST_CHUNK_CACHE_ENABLED:
+            key = f"{self.model}\n{CHUNK_PROMPT_VERSION}\n{chunk}"
+            cache_path = state_path("llm", "chunks", hashed_name(key))
+            cached = read_json(cache_path)
+            if cached and cached.get("summary"):
+                return cached["summary"]
+
+        result = self.generate_structured_output(
+            instructions=CHUNK_PROMPT,
+            user_prompt=(
+                f"Part {index} of {total} of this {article_type}:\n"
+                f"Title: {title}\nContent: {chunk}"
+            ),
+            schema_model=ChunkSummary,
+            temperature=0.3,
+        )
+        if result is None:
+            return None
+        if cache_path:
+            write_json_atomic(cache_path, result.model_dump())
+        return result.summary
@@ -1,5 +1,7 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pymongo.errors import DuplicateKeyError
 from app.api.schemas import SignupRequest, LoginRequest, UserOut
 from app.api.security import (
     hash_password,
@@ -13,18 +15,23 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/signup", response_model=UserOut)
-def signup(payload: SignupRequest, res: Response, db=Depends(get_mongo)):
-    if db["users"].find_one({"email": payload.email}):
+async def signup(payload: SignupRequest, res: Response, db=Depends(get_mongo)):
+    if await db["users"].find_one({"email": payload.email}):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     user_doc = {
         "_id": payload.email,  # simple key; could be ObjectId but email is unique
         "name": payload.name,
         "email": payload.email,
-        "password": hash_password(payload.password),
+        # bcrypt is deliberately slow; hash off the event loop.
+        "password": await run_in_threadpool(hash_password, payload.password),
         "created_at": datetime.utcnow(),
     }
-    db["users"].insert_one(user_doc)
+    try:
+        await db["users"].insert_one(user_doc)
+    except DuplicateKeyError:
+        # Concurrent signup with the same email (unique index on users.email).
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     token = create_token(sub=user_doc["_id"], email=user_doc["email"])
     # res.set_cookie(
@@ -48,9 +55,9 @@ def signup(payload: SignupRequest, res: Response, db=Depends(get_mongo)):
 
 
 @router.post("/login", response_model=UserOut)
-def login(payload: LoginRequest, res: Response, db=Depends(get_mongo)):
-    user = db["users"].find_one({"email": payload.email})
-    if not user or not verify_password(payload.password, user.get("password", "")):
+async def login(payload: LoginRequest, res: Response, db=Depends(get_mongo)):
+    user = await db["users"].find_one({"email": payload.email})
+    if not user or not await run_in_threadpool(verify_password, payload.password, user.get("password", "")):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     token = create_token(sub=user["_id"], email=user["email"])
@@ -75,7 +82,7 @@ def login(payload: LoginRequest, res: Response, db=Depends(get_mongo)):
 
 
 @router.post("/logout")
-def logout(res: Response):
+async def logout(res: Response):
     res.delete_cookie(SESSION_COOKIE_NAME)
     return {"success": True}
 
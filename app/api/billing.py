@@ -4,9 +4,10 @@ import hashlib
 import razorpay
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, Request, Header
-from app.api.deps import get_current_user
+from fastapi.concurrency import run_in_threadpool
+from app.api.deps import get_current_user, get_repository
 from app.api.schemas import BillingCheckoutRequest, PaymentVerificationRequest
-from app.database.repository import Repository
+from app.database.async_repository import AsyncRepository
 from app.database.models import SubscriptionStatus
 
 router = APIRouter(prefix="/api/billing", tags=["billing"])
@@ -32,13 +33,15 @@ def _amount_for_plan(plan: str) -> int:
 
 
 @router.post("/checkout")
-def create_checkout_session(payload: BillingCheckoutRequest, user=Depends(get_current_user)):
+async def create_checkout_session(payload: BillingCheckoutRequest, user=Depends(get_current_user)):
     plan = payload.priceId
     amount = _amount_for_plan(plan)
     currency = os.getenv("RAZORPAY_CURRENCY", "INR")
     client = _get_razorpay_client()
 
-    order = client.order.create(
+    # The Razorpay SDK is blocking; keep it off the event loop.
+    order = await run_in_threadpool(
+        client.order.create,
         {
             "amount": amount,  # paise
             "currency": currency,
@@ -57,7 +60,11 @@ def create_checkout_session(payload: BillingCheckoutRequest, user=Depends(get_cu
 
 
 @router.post("/verify-payment")
-def verify_payment(payload: PaymentVerificationRequest, user=Depends(get_current_user)):
+async def verify_payment(
+    payload: PaymentVerificationRequest,
+    user=Depends(get_current_user),
+    repo: AsyncRepository = Depends(get_repository),
+):
     """
     Verify payment immediately after Razorpay payment success.
     This endpoint verifies the payment signature and updates the subscription.
@@ -87,8 +94,8 @@ def verify_payment(payload: PaymentVerificationRequest, user=Depends(get_current
     # Get order details from Razorpay
     client = _get_razorpay_client()
     try:
-        order = client.order.fetch(razorpay_order_id)
-        payment = client.payment.fetch(razorpay_payment_id)
+        order = await run_in_threadpool(client.order.fetch, razorpay_order_id)
+        payment = await run_in_threadpool(client.payment.fetch, razorpay_payment_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to fetch payment details: {str(e)}")
     
@@ -109,30 +116,29 @@ def verify_payment(payload: PaymentVerificationRequest, user=Depends(get_current
         raise HTTPException(status_code=400, detail="Plan not found in order notes")
     
     # Update subscription in database
-    repo = Repository()
     user_id = str(user["_id"])
     
     # Ensure subscription exists
-    subscription = repo.get_user_subscription(user_id)
+    subscription = await repo.get_user_subscription(user_id)
     expires_at = datetime.now(timezone.utc) + timedelta(days=30)
     
     if not subscription:
         # Create subscription if it doesn't exist
         # First create with ACTIVE status
-        new_subscription = repo.create_user_subscription(
+        new_subscription = await repo.create_user_subscription(
             user_id=user_id,
             status=SubscriptionStatus.ACTIVE,
             plan=plan,
             trial_days=0  # Not a trial, already paid
         )
         # Then update expires_at (create_user_subscription sets it for TRIAL only)
-        repo.update_subscription(
+        await repo.update_subscription(
             user_id=user_id,
             expires_at=expires_at
         )
     else:
         # Update existing subscription
-        success = repo.update_subscription(
+        success = await repo.update_subscription(
             user_id=user_id,
             status=SubscriptionStatus.ACTIVE,
             plan=plan,
@@ -151,12 +157,11 @@ def verify_payment(payload: PaymentVerificationRequest, user=Depends(get_current
 
 
 @router.get("/status")
-def get_subscription_status(user=Depends(get_current_user)):
+async def get_subscription_status(user=Depends(get_current_user), repo: AsyncRepository = Depends(get_repository)):
     """Get current subscription status for the logged-in user."""
-    repo = Repository()
     user_id = str(user["_id"])
     
-    subscription = repo.get_user_subscription(user_id)
+    subscription = await repo.get_user_subscription(user_id)
     if not subscription:
         return {
             "status": "trial",
@@ -188,7 +193,11 @@ def get_subscription_status(user=Depends(get_current_user)):
 
 
 @router.post("/webhook")
-async def razorpay_webhook(request: Request, x_razorpay_signature: str = Header(None)):
+async def razorpay_webhook(
+    request: Request,
+    x_razorpay_signature: str = Header(None),
+    repo: AsyncRepository = Depends(get_repository),
+):
     """Handle Razorpay webhook events to update subscription status."""
     key_secret = os.getenv("RAZORPAY_KEY_SECRET")
     if not key_secret:
@@ -225,10 +234,9 @@ async def razorpay_webhook(request: Request, x_razorpay_signature: str = Header(
             raise HTTPException(status_code=400, detail="Missing user or plan in order notes")
         
         # Update subscription
-        repo = Repository()
         # Set subscription to active for 30 days
         expires_at = datetime.now(timezone.utc) + timedelta(days=30)
-        repo.update_subscription(
+        await repo.update_subscription(
             user_id=str(user_id),
             status=SubscriptionStatus.ACTIVE,
             plan=plan,
@@ -1,21 +1,26 @@
 from fastapi import APIRouter, Depends
-from app.api.deps import get_current_user, get_mongo
+from app.api.deps import get_current_user, get_mongo, get_repository
 from app.api.schemas import ChannelsPayload
-from app.database.repository import Repository
+from app.database.async_repository import AsyncRepository
 
 router = APIRouter(prefix="/api", tags=["channels"])
 
 
 @router.get("/channels")
-def get_channels(user=Depends(get_current_user), db=Depends(get_mongo)):
+async def get_channels(user=Depends(get_current_user), db=Depends(get_mongo)):
     """Get channels from MongoDB (for API responses)."""
-    doc = db["channels"].find_one({"_id": user["_id"]})
+    doc = await db["channels"].find_one({"_id": user["_id"]})
     channel_ids = doc.get("channel_ids", []) if doc else []
     return {"channel_ids": channel_ids}
 
 
 @router.post("/channels")
-def upsert_channels(payload: ChannelsPayload, user=Depends(get_current_user), db=Depends(get_mongo)):
+async def upsert_channels(
+    payload: ChannelsPayload,
+    user=Depends(get_current_user),
+    db=Depends(get_mongo),
+    repo: AsyncRepository = Depends(get_repository),
+):
     """Store channels in both MongoDB (for API) and PostgreSQL (for pipeline)."""
     from fastapi import HTTPException
     from sqlalchemy.exc import ProgrammingError
@@ -23,7 +28,7 @@ def upsert_channels(payload: ChannelsPayload, user=Depends(get_current_user), db
     user_id = str(user["_id"])
     
     # Store in MongoDB (for API responses)
-    db["channels"].update_one(
+    await db["channels"].update_one(
         {"_id": user["_id"]},
         {"$set": {"channel_ids": payload.channel_ids, "_id": user["_id"]}},
         upsert=True,
@@ -31,8 +36,7 @@ def upsert_channels(payload: ChannelsPayload, user=Depends(get_current_user), db
     
     # Store in PostgreSQL (for pipeline)
     try:
-        repo = Repository()
-        repo.upsert_user_channels(user_id, payload.channel_ids)
+        await repo.upsert_user_channels(user_id, payload.channel_ids)
     except ProgrammingError as e:
         if "does not exist" in str(e):
             raise HTTPException(
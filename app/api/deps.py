@@ -1,21 +1,28 @@
-import os
 from fastapi import Depends, HTTPException, Request, status
 from app.api.security import decode_token, SESSION_COOKIE_NAME
-from app.database.mongo import get_db
+from app.database.mongo import get_async_db
+from app.database.async_repository import AsyncRepository
 
 
-def get_mongo():
-    return get_db()
+async def get_mongo():
+    # async so FastAPI calls it on the event loop instead of the threadpool.
+    return get_async_db()
 
 
-def get_current_user(req: Request, db=Depends(get_mongo)):
+async def get_repository():
+    """Request-scoped AsyncRepository; its session goes back to the pool after the response."""
+    async with AsyncRepository.session_scope() as repo:
+        yield repo
+
+
+async def get_current_user(req: Request, db=Depends(get_mongo)):
     token = req.cookies.get(SESSION_COOKIE_NAME)
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     payload = decode_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db["users"].find_one({"_id": payload["sub"]})
+    user = await db["users"].find_one({"_id": payload["sub"]})
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
@@ -0,0 +1,139 @@
+"""
+Load test for the API's Postgres connection pool.
+
+Sends concurrent requests to an authenticated endpoint that queries
+Postgres while sampling /api/health/db, then reports latency percentiles
+and checked-out connections over time. With request-scoped sessions the
+checked-out count stays within the pool and returns to its starting
+value once the run ends; a count that keeps climbing means sessions are
+leaking.
+
+    DB_HEALTH_ENDPOINT_ENABLED=true uvicorn app.api.server:app --port 8000
+    python -m app.api.load_test --user-id <user id> --requests 2000 --concurrency 50
+
+/api/health/db only exists when the server runs with
+DB_HEALTH_ENDPOINT_ENABLED=true, and requires the same session cookie.
+The cookie is signed with JWT_SECRET, so it must match the server's.
+The user must exist in MongoDB.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.api.security import create_token, SESSION_COOKIE_NAME
+
+
+async def pool_stats(client: httpx.AsyncClient) -> dict:
+    response = await client.get("/api/health/db")
+    response.raise_for_status()
+    return response.json()
+
+
+async def sample_pool(client: httpx.AsyncClient, interval: float, samples: List[dict], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            samples.append({"t": time.perf_counter(), **await pool_stats(client)})
+        except httpx.HTTPError as e:
+            print(f"pool sample failed: {e}", file=sys.stderr)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(args) -> int:
+    token = args.token or create_token(args.user_id, args.email or args.user_id)
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        cookies={SESSION_COOKIE_NAME: token},
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        before = await pool_stats(client)
+        latencies: List[float] = []
+        statuses: Counter = Counter()
+        queue: asyncio.Queue = asyncio.Queue()
+        for _ in range(args.requests):
+            queue.put_nowait(None)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = await client.get(args.path)
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        samples: List[dict] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_pool(client, args.sample_interval, samples, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+        after = await pool_stats(client)
+
+    print(f"{args.requests} requests to {args.path} in {elapsed:.1f}s ({args.requests / elapsed:.0f} req/s)")
+    print(f"Status codes: {dict(statuses)}")
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+        print(
+            f"Latency ms: p50={cuts[49] * 1000:.1f} p95={cuts[94] * 1000:.1f} "
+            f"p99={cuts[98] * 1000:.1f} max={max(latencies) * 1000:.1f}"
+        )
+
+    checked_out = [s["checked_out"] for s in samples if s.get("initialized")]
+    if checked_out:
+        # Show the trend in roughly ten buckets: it should plateau, not ramp.
+        step = max(1, len(checked_out) // 10)
+        trend = [max(checked_out[i:i + step]) for i in range(0, len(checked_out), step)]
+        print(f"Checked-out connections over time: {trend}")
+    print(
+        f"Pool before: {before.get('checked_out', 0)} checked out; "
+        f"after: {after.get('checked_out')} checked out, peak {after.get('peak_checked_out')} "
+        f"of {after.get('max_connections')} allowed"
+    )
+    leaked = after.get("checked_out", 0) - before.get("checked_out", 0)
+    if leaked > 0:
+        print(f"✗ {leaked} connections still checked out after the run")
+        return 1
+    print("✓ Pool usage returned to its starting level")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/billing/status", help="endpoint to load (should query Postgres)")
+    auth = parser.add_mutually_exclusive_group(required=True)
+    auth.add_argument("--token", help="existing session cookie value")
+    auth.add_argument("--user-id", help="MongoDB user _id to sign a session token for")
+    parser.add_argument("--email", help="email claim for --user-id (defaults to the user id)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sample-interval", type=float, default=0.2, help="seconds between pool samples")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
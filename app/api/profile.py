@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends
-from app.api.deps import get_current_user, get_mongo
+from app.api.deps import get_current_user, get_mongo, get_repository
 from app.api.schemas import ProfilePayload
-from app.database.repository import Repository
+from app.database.async_repository import AsyncRepository
 from app.database.models import SubscriptionStatus
 
 router = APIRouter(prefix="/api", tags=["profile"])
 
 
 @router.get("/profile")
-def get_profile(user=Depends(get_current_user), db=Depends(get_mongo)):
-    doc = db["profiles"].find_one({"_id": user["_id"]})
+async def get_profile(user=Depends(get_current_user), db=Depends(get_mongo)):
+    doc = await db["profiles"].find_one({"_id": user["_id"]})
     if not doc:
         return {"profile": None}
     doc["_id"] = str(doc["_id"])
@@ -17,7 +17,12 @@ def get_profile(user=Depends(get_current_user), db=Depends(get_mongo)):
 
 
 @router.post("/profile")
-def upsert_profile(payload: ProfilePayload, user=Depends(get_current_user), db=Depends(get_mongo)):
+async def upsert_profile(
+    payload: ProfilePayload,
+    user=Depends(get_current_user),
+    db=Depends(get_mongo),
+    repo: AsyncRepository = Depends(get_repository),
+):
     """Create/update profile and create subscription entry if it doesn't exist."""
     from fastapi import HTTPException
     from sqlalchemy.exc import ProgrammingError
@@ -31,7 +36,7 @@ def upsert_profile(payload: ProfilePayload, user=Depends(get_current_user), db=D
         profile_data["email_to"] = user_email
     
     # Store in MongoDB
-    db["profiles"].update_one(
+    await db["profiles"].update_one(
         {"_id": user["_id"]},
         {"$set": {"profile": profile_data, "_id": user["_id"]}},
         upsert=True,
@@ -39,10 +44,9 @@ def upsert_profile(payload: ProfilePayload, user=Depends(get_current_user), db=D
     
     # Create subscription entry in PostgreSQL if it doesn't exist
     try:
-        repo = Repository()
-        existing_subscription = repo.get_user_subscription(user_id)
+        existing_subscription = await repo.get_user_subscription(user_id)
         if not existing_subscription:
-            repo.create_user_subscription(
+            await repo.create_user_subscription(
                 user_id=user_id,
                 status=SubscriptionStatus.TRIAL,
                 plan=None,
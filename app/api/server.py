@@ -3,15 +3,20 @@ import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import auth, profile, channels, billing
-from app.api.deps import get_mongo
+from app.api.deps import get_mongo, get_current_user
+from app.database.mongo import ensure_indexes, close_async_mongo_client
+from app.database.connection import configure_database, get_async_pool_stats, dispose_async_engine
 
 # Load environment variables early so MONGODB_URL and others are available.
 load_dotenv()
 
+# Request-sized DB pool; the engine itself is only created on first use.
+configure_database("api")
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -24,13 +29,16 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
-    db = get_mongo()
+    db = await get_mongo()
     # simple connectivity check
-    db.command("ping")
+    await db.command("ping")
     logger.info("MongoDB connected successfully")
+    await ensure_indexes(db)
     yield
-    # Shutdown (if needed in future)
+    # Shutdown
     logger.info("Shutting down...")
+    await dispose_async_engine()
+    await close_async_mongo_client()
 
 
 app = FastAPI(title="AI Notify API", version="1.0.0", lifespan=lifespan)
@@ -57,10 +65,20 @@ app.add_middleware(
 
 
 @app.get("/api/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 
+# Pool metrics are internal: only exposed when explicitly enabled (load
+# testing, debugging), and then only to signed-in users.
+if os.getenv("DB_HEALTH_ENDPOINT_ENABLED", "false").lower() == "true":
+
+    @app.get("/api/health/db", dependencies=[Depends(get_current_user)])
+    async def health_db():
+        """Postgres pool usage of the API's async engine (see app/api/load_test.py)."""
+        return get_async_pool_stats()
+
+
 app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(channels.router)
@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
@@ -9,12 +10,15 @@ from app.services.process_youtube import process_youtube_transcripts
 from app.services.process_digest import process_digests
 from app.services.process_email import send_digest_email_for_user, get_user_profile_from_mongo
 from app.database.repository import Repository
-from app.database.models import Base
-from app.database.connection import engine
+from app.database.connection import configure_database, get_pool_stats
+from app.config import EMAIL_WORKERS, EMAIL_SEND_RECORD_BATCH_SIZE, EMAIL_SEND_RECORD_RETRIES
 
 # Load environment variables (API keys, DB URL, email creds).
 load_dotenv()
 
+# Size the DB pool for the pipeline's worker threads (see app.database.connection).
+configure_database("pipeline")
+
 # Configure root logger once for the whole pipeline.
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +28,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def record_sent_digests(repo: Repository, sent_digests: dict, retries: int = EMAIL_SEND_RECORD_RETRIES) -> int:
+    """
+    Record one batch of sends (user_id -> digest IDs) in a single multi-row
+    insert, retrying with backoff. Returns rows added; raises after the last
+    failed attempt.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return repo.mark_digests_as_sent_for_users(sent_digests)
+        except Exception as e:
+            repo.session.rollback()
+            if attempt == retries:
+                raise
+            delay = 2 ** attempt
+            logger.warning(
+                f"Recording sends for {len(sent_digests)} users failed ({e}), retrying in {delay}s"
+            )
+            time.sleep(delay)
+    return 0
+
+
 def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
     """
     Orchestrate the full daily flow: scrape sources, enrich content,
@@ -51,6 +76,7 @@ def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
         "success": False,
     }
 
+    repo = None
     try:
         repo = Repository()
         
@@ -95,7 +121,8 @@ def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
         results["processing"]["youtube"] = youtube_result
         logger.info(
             f"✓ Processed {youtube_result['processed']} transcripts "
-            f"({youtube_result['unavailable']} unavailable)"
+            f"({youtube_result['unavailable']} unavailable, "
+            f"{youtube_result['retry_scheduled']} scheduled for retry)"
         )
 
         logger.info("\n[5/6] Creating digests for articles...")
@@ -121,49 +148,79 @@ def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
                     logger.warning(f"No profile found for user {user_id}, skipping...")
                     return {"success": False, "user_id": user_id, "error": "No profile found"}
                 
-                # Send email
-                email_result = send_digest_email_for_user(
-                    user_id=user_id,
-                    user_profile=user_profile,
-                    channel_ids=channel_ids,
-                    hours=hours,
-                    top_n=top_n
-                )
-                return email_result
+                # Send email; one DB session per task, closed when it finishes
+                with Repository.session_scope() as user_repo:
+                    return send_digest_email_for_user(
+                        user_id=user_id,
+                        user_profile=user_profile,
+                        channel_ids=channel_ids,
+                        hours=hours,
+                        top_n=top_n,
+                        mark_sent=False,
+                        repo=user_repo,
+                    )
             except Exception as e:
                 logger.error(f"Error processing user {user_id}: {e}", exc_info=True)
                 return {"success": False, "user_id": user_id, "error": str(e)}
         
-        # Process users in parallel (max 10 concurrent)
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_user = {
-                executor.submit(process_user_email, user_data): user_data
-                for user_data in active_users
-            }
-            
-            for future in as_completed(future_to_user):
-                user_data = future_to_user[future]
-                try:
-                    email_result = future.result()
-                    if email_result.get("success"):
-                        results["emails"]["sent"] += 1
-                        logger.info(f"✓ Email sent to user {email_result.get('user_id')}")
-                    elif email_result.get("skipped"):
-                        results["emails"]["skipped"] += 1
-                    else:
+        # Sends are recorded in batches as emails go out, so a crash or a failed
+        # insert never forgets emails that were already delivered.
+        sent_digests = {}
+        results["emails"]["marked_as_sent"] = 0
+
+        def flush_sent_digests():
+            if not sent_digests:
+                return
+            try:
+                marked = record_sent_digests(repo, sent_digests)
+            except Exception as e:
+                # Kept pending; the next flush tries again.
+                logger.error(f"Could not record sends for users {sorted(sent_digests)}: {e}", exc_info=True)
+                return
+            results["emails"]["marked_as_sent"] += marked
+            logger.info(f"✓ Marked {marked} digests as sent for {len(sent_digests)} users")
+            sent_digests.clear()
+
+        # Process users in parallel
+        try:
+            with ThreadPoolExecutor(max_workers=EMAIL_WORKERS) as executor:
+                future_to_user = {
+                    executor.submit(process_user_email, user_data): user_data
+                    for user_data in active_users
+                }
+
+                for future in as_completed(future_to_user):
+                    user_data = future_to_user[future]
+                    try:
+                        email_result = future.result()
+                        if email_result.get("success"):
+                            results["emails"]["sent"] += 1
+                            sent_digests[email_result["user_id"]] = email_result.get("digest_ids", [])
+                            logger.info(f"✓ Email sent to user {email_result.get('user_id')}")
+                        elif email_result.get("skipped"):
+                            results["emails"]["skipped"] += 1
+                        else:
+                            results["emails"]["failed"] += 1
+                            logger.error(f"✗ Failed to send email to user {email_result.get('user_id')}: {email_result.get('error')}")
+                        results["users_processed"] += 1
+                    except Exception as e:
                         results["emails"]["failed"] += 1
-                        logger.error(f"✗ Failed to send email to user {email_result.get('user_id')}: {email_result.get('error')}")
-                    results["users_processed"] += 1
-                except Exception as e:
-                    results["emails"]["failed"] += 1
-                    results["users_processed"] += 1
-                    logger.error(f"✗ Exception processing user {user_data['user_id']}: {e}")
+                        results["users_processed"] += 1
+                        logger.error(f"✗ Exception processing user {user_data['user_id']}: {e}")
+                    if len(sent_digests) >= EMAIL_SEND_RECORD_BATCH_SIZE:
+                        flush_sent_digests()
+        finally:
+            flush_sent_digests()
+        logger.info(f"DB pool after email stage: {get_pool_stats()}")
 
         results["success"] = results["emails"]["sent"] > 0 or results["emails"]["skipped"] > 0
 
     except Exception as e:
         logger.error(f"Pipeline failed with error: {e}", exc_info=True)
         results["error"] = str(e)
+    finally:
+        if repo is not None:
+            repo.close()
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
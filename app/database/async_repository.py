@@ -0,0 +1,135 @@
+"""Async (asyncpg) counterpart of Repository for the API's subscription and channel queries."""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import UserChannel, UserSubscription, SubscriptionStatus
+from .connection import get_async_sessionmaker
+from .repository import subscription_status_summary
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """
+    Columns are TIMESTAMP WITHOUT TIME ZONE holding UTC. psycopg2 drops the
+    offset of aware datetimes silently; asyncpg rejects them, so convert.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class AsyncRepository:
+    """Subscription and channel helpers used by the async API routers."""
+
+    def __init__(self, session: Optional[AsyncSession] = None):
+        # Only sessions created here are closed by close() / the context manager.
+        self._owns_session = session is None
+        self.session = session or get_async_sessionmaker()()
+
+    @classmethod
+    def session_scope(cls) -> "AsyncRepository":
+        """
+        AsyncRepository on its own session, for use as an async context manager:
+
+            async with AsyncRepository.session_scope() as repo:
+                ...
+        """
+        return cls()
+
+    async def close(self) -> None:
+        """Return the session's connection to the pool (no-op for borrowed sessions)."""
+        if self._owns_session:
+            await self.session.close()
+
+    async def __aenter__(self) -> "AsyncRepository":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            await self.session.rollback()
+        await self.close()
+
+    # User-Channel Operations
+    async def upsert_user_channels(self, user_id: str, channel_ids: List[str]) -> int:
+        """Replace a user's channels. Returns number of channels added."""
+        await self.session.execute(delete(UserChannel).where(UserChannel.user_id == user_id))
+        self.session.add_all(
+            UserChannel(user_id=user_id, channel_id=channel_id) for channel_id in channel_ids
+        )
+        await self.session.commit()
+        return len(channel_ids)
+
+    async def get_user_channels(self, user_id: str) -> List[str]:
+        """Get all channel IDs for a specific user."""
+        result = await self.session.scalars(
+            select(UserChannel.channel_id).where(UserChannel.user_id == user_id)
+        )
+        return list(result)
+
+    async def delete_user_channels(self, user_id: str) -> int:
+        """Delete all channels for a user (when subscription expires)."""
+        result = await self.session.execute(delete(UserChannel).where(UserChannel.user_id == user_id))
+        await self.session.commit()
+        return result.rowcount
+
+    # Subscription Operations
+    async def create_user_subscription(
+        self,
+        user_id: str,
+        status: SubscriptionStatus = SubscriptionStatus.TRIAL,
+        plan: Optional[str] = None,
+        trial_days: int = 2
+    ) -> UserSubscription:
+        """Create a new subscription entry for a user."""
+        now = _naive_utc(datetime.now(timezone.utc))
+        trial_expires = now + timedelta(days=trial_days)
+
+        subscription = UserSubscription(
+            user_id=user_id,
+            subscription_status=status,
+            subscription_plan=plan,
+            trial_started_at=now,
+            subscription_expires_at=trial_expires if status == SubscriptionStatus.TRIAL else None,
+        )
+        self.session.add(subscription)
+        await self.session.commit()
+        return subscription
+
+    async def get_user_subscription(self, user_id: str) -> Optional[UserSubscription]:
+        """Get subscription for a user."""
+        return await self.session.scalar(
+            select(UserSubscription).where(UserSubscription.user_id == user_id)
+        )
+
+    async def update_subscription(
+        self,
+        user_id: str,
+        status: Optional[SubscriptionStatus] = None,
+        plan: Optional[str] = None,
+        expires_at: Optional[datetime] = None
+    ) -> bool:
+        """Update subscription status and plan."""
+        subscription = await self.get_user_subscription(user_id)
+        if not subscription:
+            return False
+
+        if status:
+            subscription.subscription_status = status
+        if plan is not None:
+            subscription.subscription_plan = plan
+        if expires_at:
+            subscription.subscription_expires_at = _naive_utc(expires_at)
+        if status == SubscriptionStatus.ACTIVE and not subscription.subscription_started_at:
+            subscription.subscription_started_at = _naive_utc(datetime.now(timezone.utc))
+
+        subscription.updated_at = _naive_utc(datetime.now(timezone.utc))
+        await self.session.commit()
+        return True
+
+    async def check_subscription_status(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Check if user subscription is active."""
+        subscription = await self.get_user_subscription(user_id)
+        if not subscription:
+            return None
+        return subscription_status_summary(subscription)
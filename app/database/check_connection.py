@@ -1,7 +1,7 @@
 """Standalone script to verify DB connectivity and schema shape."""
 
 import sys
-from app.database.connection import get_database_info, engine
+from app.database.connection import get_database_info, get_engine
 from sqlalchemy import text
 
 if __name__ == "__main__":
@@ -16,7 +16,7 @@ if __name__ == "__main__":
     print("=" * 60 + "\n")
 
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             result = conn.execute(text("SELECT version()"))
             version = result.scalar()
             print("✓ Connection successful!")
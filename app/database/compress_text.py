@@ -0,0 +1,92 @@
+"""
+One-off migration of large text columns to compressed bytea storage.
+
+Applied automatically as a schema migration (see app/database/migrations.py);
+can also be run on its own (safe to re-run):
+
+    python -m app.database.compress_text
+
+Each column is first converted in place to the uncompressed storage format
+(a single ALTER TABLE, no Python round trip), then rows big enough to
+benefit are compressed in primary-key order in small batches.
+"""
+
+from sqlalchemy import text
+from app.database.types import (
+    RAW_HEADER,
+    ZLIB_HEADER,
+    COMPRESSION_MIN_BYTES,
+    compress_text,
+    decompress_text,
+)
+
+# (table, primary key, column)
+COMPRESSED_COLUMNS = [
+    ("youtube_videos", "video_id", "transcript"),
+    ("anthropic_articles", "guid", "markdown"),
+]
+BATCH_SIZE = 200
+
+
+def convert_column(conn, table: str, column: str) -> bool:
+    """ALTER a text column to bytea with the raw header prepended; False if already done."""
+    data_type = conn.execute(
+        text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar()
+    if data_type != "text":
+        return False
+    conn.execute(
+        text(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea "
+            f"USING decode('{RAW_HEADER.hex()}', 'hex') || convert_to({column}, 'UTF8')"
+        )
+    )
+    return True
+
+
+def compress_rows(engine, table: str, key: str, column: str, batch_size: int = BATCH_SIZE) -> int:
+    """Compress raw-stored values in keyset-paginated batches; returns rows rewritten."""
+    select = text(
+        f"SELECT {key}, {column} FROM {table} "
+        f"WHERE {key} > :last_key AND {column} IS NOT NULL "
+        f"AND substring({column} from 1 for 1) = decode('{RAW_HEADER.hex()}', 'hex') "
+        f"AND octet_length({column}) > :min_bytes "
+        f"ORDER BY {key} LIMIT :limit"
+    )
+    update = text(f"UPDATE {table} SET {column} = :value WHERE {key} = :key")
+    last_key = ""
+    rewritten = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select,
+                {"last_key": last_key, "min_bytes": COMPRESSION_MIN_BYTES, "limit": batch_size},
+            ).all()
+            if not rows:
+                return rewritten
+            updates = []
+            for row_key, value in rows:
+                encoded = compress_text(decompress_text(value))
+                if encoded[:1] == ZLIB_HEADER:
+                    updates.append({"key": row_key, "value": encoded})
+            if updates:
+                conn.execute(update, updates)
+            rewritten += len(updates)
+            last_key = rows[-1][0]
+        print(f"  {table}.{column}: {rewritten} rows compressed so far")
+
+
+if __name__ == "__main__":
+    from app.database.connection import get_engine
+
+    engine = get_engine()
+    for table, key, column in COMPRESSED_COLUMNS:
+        with engine.begin() as conn:
+            converted = convert_column(conn, table, column)
+        print(f"{table}.{column}: {'converted to bytea' if converted else 'already bytea'}")
+        total = compress_rows(engine, table, key, column)
+        print(f"{table}.{column}: {total} rows compressed")
@@ -1,7 +1,11 @@
 """Database engine/session helpers for SQLAlchemy."""
 
 import os
-from sqlalchemy import create_engine
+import threading
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -29,6 +33,17 @@ def get_database_url() -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{db}"
 
 
+def get_async_database_url() -> str:
+    """get_database_url() for the asyncpg driver used by the async API repository."""
+    url = make_url(get_database_url()).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    # asyncpg takes `ssl` where libpq takes `sslmode` (e.g. ?sslmode=require on Render).
+    sslmode = query.pop("sslmode", None)
+    if sslmode:
+        query["ssl"] = sslmode
+    return url.set(query=query).render_as_string(hide_password=False)
+
+
 def get_database_info() -> dict:
     """Return masked DB info for logging/diagnostics."""
     url = get_database_url()
@@ -56,10 +71,160 @@ def get_database_info() -> dict:
     }
 
 
-engine = create_engine(get_database_url())
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool settings per deployment role. The API serves short requests from a
+# thread pool, the pipeline runs up to 10 email workers next to the main
+# thread, and one-off scripts need only a connection or two. Every value can
+# be overridden for the active role with DB_POOL_SIZE, DB_MAX_OVERFLOW,
+# DB_POOL_TIMEOUT, DB_POOL_RECYCLE and DB_POOL_PRE_PING.
+POOL_DEFAULTS = {
+    "api": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 10, "pool_recycle": 1800, "pool_pre_ping": True},
+    "pipeline": {"pool_size": 12, "max_overflow": 4, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+    "script": {"pool_size": 2, "max_overflow": 2, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+}
+_POOL_ENV = {
+    "pool_size": ("DB_POOL_SIZE", int),
+    "max_overflow": ("DB_MAX_OVERFLOW", int),
+    "pool_timeout": ("DB_POOL_TIMEOUT", float),
+    "pool_recycle": ("DB_POOL_RECYCLE", int),
+    "pool_pre_ping": ("DB_POOL_PRE_PING", lambda value: value.lower() == "true"),
+}
+
+_lock = threading.Lock()
+_role = os.getenv("DB_ROLE", "script").lower()
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_peak_checked_out = 0
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_peak_checked_out = 0
+
+
+def configure_database(role: str) -> None:
+    """
+    Select the pool profile ("api", "pipeline" or "script") for this process.
+
+    Must be called by the entry point before the first database access;
+    the DB_ROLE environment variable sets the default.
+    """
+    global _role
+    role = role.lower()
+    if role not in POOL_DEFAULTS:
+        raise ValueError(f"Unknown database role {role!r}, expected one of {sorted(POOL_DEFAULTS)}")
+    with _lock:
+        if (_engine is not None or _async_engine is not None) and role != _role:
+            raise RuntimeError(f"Database engine already created for role {_role!r}")
+        _role = role
+
+
+def get_pool_settings(role: Optional[str] = None) -> dict:
+    """Pool keyword arguments for a role, with environment overrides applied."""
+    settings = dict(POOL_DEFAULTS.get(role or _role, POOL_DEFAULTS["script"]))
+    for key, (env_name, parse) in _POOL_ENV.items():
+        value = os.getenv(env_name)
+        if value:
+            settings[key] = parse(value)
+    return settings
+
+
+def _track_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    global _peak_checked_out
+    checked_out = _engine.pool.checkedout() if _engine is not None else 0
+    _peak_checked_out = max(_peak_checked_out, checked_out)
+
+
+def get_engine() -> Engine:
+    """Create the process-wide engine on first use."""
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = create_engine(get_database_url(), **get_pool_settings())
+                event.listen(engine.pool, "checkout", _track_checkout)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def _track_async_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    global _async_peak_checked_out
+    checked_out = _async_engine.pool.checkedout() if _async_engine is not None else 0
+    _async_peak_checked_out = max(_async_peak_checked_out, checked_out)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Create the process-wide asyncpg engine on first use (same pool settings
+    as get_engine()). It binds to the running event loop, so only use it
+    from the API's loop.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                engine = create_async_engine(get_async_database_url(), **get_pool_settings())
+                event.listen(engine.sync_engine.pool, "checkout", _track_async_checkout)
+                _async_session_factory = async_sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False
+                )
+                _async_engine = engine
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    get_async_engine()
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections (API shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine, _async_session_factory = None, None
+
+
+def get_sessionmaker() -> sessionmaker:
+    get_engine()
+    return _session_factory
 
 
 def get_session():
     """Return a new SQLAlchemy session bound to the configured engine."""
-    return SessionLocal()
+    return get_sessionmaker()()
+
+
+def _pool_stats(engine, peak_checked_out: int) -> dict:
+    if engine is None:
+        return {"role": _role, "initialized": False}
+    pool = engine.pool
+    return {
+        "role": _role,
+        "initialized": True,
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "peak_checked_out": peak_checked_out,
+        "max_connections": pool.size() + get_pool_settings()["max_overflow"],
+        "status": pool.status(),
+    }
+
+
+def get_pool_stats() -> dict:
+    """Connection pool usage, for spotting exhaustion (e.g. during the email stage)."""
+    return _pool_stats(_engine, _peak_checked_out)
+
+
+def get_async_pool_stats() -> dict:
+    """get_pool_stats() for the async engine used by the API."""
+    return _pool_stats(_async_engine, _async_peak_checked_out)
+
+
+def __getattr__(name: str):
+    # Backwards compatibility: `from app.database.connection import engine`
+    # (or SessionLocal) still works, but now creates the engine lazily.
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
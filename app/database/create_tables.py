@@ -1,16 +1,20 @@
 """Simple helper to create all SQLAlchemy tables for local dev."""
 
-from app.database.models import Base
-from app.database.connection import engine
+from app.database.connection import get_engine
+from app.database.migrations import run_migrations
 
 if __name__ == "__main__":
-    Base.metadata.create_all(engine)
-    print("Tables created successfully:")
+    # Fresh databases get every table from the first migration; existing ones
+    # only receive the migrations they are missing.
+    applied = run_migrations(get_engine())
+    print(f"Schema up to date ({len(applied)} migrations applied).")
+    print("Tables:")
     print("  - youtube_videos")
+    print("  - transcript_attempts")
     print("  - openai_articles")
     print("  - anthropic_articles")
     print("  - digests")
     print("  - user_channels")
     print("  - user_subscriptions")
     print("  - digest_sends")
-
+    print("  - schema_migrations")
@@ -0,0 +1,178 @@
+"""
+Print EXPLAIN plans for the Repository's hot queries.
+
+Each query is captured from the SQL a Repository method actually emits, so
+plans stay in sync with the code. Against an empty database the planner
+favours sequential scans regardless of indexes, so a synthetic data set can
+be seeded first (rows are tagged and removed again with --cleanup):
+
+    python -m app.database.explain --seed 20000 --cleanup
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+from sqlalchemy import event, insert, delete, text
+from app.database.connection import get_engine, get_session
+from app.database.models import (
+    YouTubeVideo, OpenAIArticle, AnthropicArticle, Digest, DigestSend,
+    UserChannel, UserSubscription, SubscriptionStatus, TranscriptAttempt,
+)
+from app.database.repository import Repository
+
+SEED_PREFIX = "explain-seed-"
+SEED_USER = f"{SEED_PREFIX}user"
+SEED_CHANNELS = [f"{SEED_PREFIX}channel-{i}" for i in range(20)]
+
+
+def seed(session, rows: int) -> None:
+    """Insert a synthetic, realistically skewed data set tagged with SEED_PREFIX."""
+    now = datetime.now(timezone.utc)
+    videos, articles, digests, sends = [], [], [], []
+    for i in range(rows):
+        video_id = f"{SEED_PREFIX}v{i}"
+        published_at = now - timedelta(hours=random.uniform(0, 24 * 365))
+        # Most videos are fully processed; a small backlog lacks transcripts.
+        has_transcript = random.random() > 0.05
+        videos.append({
+            "video_id": video_id,
+            "title": f"Video {i}",
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "channel_id": random.choice(SEED_CHANNELS),
+            "published_at": published_at,
+            "description": "Synthetic video",
+            "transcript": ("transcript " * 400) if has_transcript else None,
+        })
+        if has_transcript and random.random() > 0.1:
+            digests.append({
+                "id": f"youtube:{video_id}",
+                "article_type": "youtube",
+                "article_id": video_id,
+                "url": videos[-1]["url"],
+                "title": f"Video {i}",
+                "summary": "Synthetic summary",
+                "created_at": published_at,
+            })
+    for i in range(rows // 10):
+        guid = f"{SEED_PREFIX}a{i}"
+        published_at = now - timedelta(hours=random.uniform(0, 24 * 365))
+        articles.append({
+            "guid": guid,
+            "title": f"Article {i}",
+            "url": f"https://example.com/{guid}",
+            "description": "Synthetic article",
+            "published_at": published_at,
+            "markdown": ("markdown " * 400) if random.random() > 0.05 else None,
+        })
+        digests.append({
+            "id": f"anthropic:{guid}",
+            "article_type": "anthropic",
+            "article_id": guid,
+            "url": articles[-1]["url"],
+            "title": f"Article {i}",
+            "summary": "Synthetic summary",
+            "created_at": published_at,
+        })
+    for digest in random.sample(digests, len(digests) // 2):
+        sends.append({"digest_id": digest["id"], "user_id": SEED_USER})
+
+    session.execute(insert(YouTubeVideo), videos)
+    session.execute(insert(AnthropicArticle), articles)
+    session.execute(insert(Digest), digests)
+    session.execute(insert(DigestSend), sends)
+    session.execute(insert(UserChannel), [
+        {"user_id": SEED_USER, "channel_id": channel_id} for channel_id in SEED_CHANNELS[:5]
+    ])
+    session.execute(insert(UserSubscription).values(
+        user_id=SEED_USER,
+        subscription_status=SubscriptionStatus.ACTIVE,
+        trial_started_at=now,
+    ))
+    session.commit()
+    for table in ("youtube_videos", "anthropic_articles", "digests", "digest_sends"):
+        session.execute(text(f"ANALYZE {table}"))
+    session.commit()
+
+
+def cleanup(session) -> None:
+    for model, column in (
+        (DigestSend, DigestSend.user_id),
+        (Digest, Digest.article_id),
+        (TranscriptAttempt, TranscriptAttempt.video_id),
+        (YouTubeVideo, YouTubeVideo.video_id),
+        (AnthropicArticle, AnthropicArticle.guid),
+        (OpenAIArticle, OpenAIArticle.guid),
+        (UserChannel, UserChannel.user_id),
+        (UserSubscription, UserSubscription.user_id),
+    ):
+        session.execute(delete(model).where(column.startswith(SEED_PREFIX)))
+    session.commit()
+
+
+def hot_queries(repo: Repository) -> List[Tuple[str, Callable[[], object]]]:
+    return [
+        ("get_youtube_videos_without_transcript", lambda: repo.get_youtube_videos_without_transcript(limit=50)),
+        ("get_anthropic_articles_without_markdown", lambda: repo.get_anthropic_articles_without_markdown(limit=50)),
+        ("get_articles_without_digest", lambda: repo.get_articles_without_digest(limit=50)),
+        ("get_recent_digests", lambda: repo.get_recent_digests(hours=24)),
+        ("get_active_users_with_channels", lambda: repo.get_active_users_with_channels()),
+        (
+            "get_recent_digests_for_user",
+            lambda: repo.get_recent_digests_for_user(SEED_USER, SEED_CHANNELS[:5], hours=24 * 7),
+        ),
+    ]
+
+
+def capture_statements(func: Callable[[], object]) -> List[Tuple[str, object]]:
+    """Run func and return the SELECT statements it sent to the database."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(analyze: bool = True) -> None:
+    session = get_session()
+    repo = Repository(session=session)
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+    for name, func in hot_queries(repo):
+        statements = capture_statements(func)
+        session.rollback()
+        print(f"\n=== {name} ({len(statements)} statement{'s' if len(statements) != 1 else ''}) ===")
+        for statement, parameters in statements:
+            with get_engine().connect() as conn:
+                plan = conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)
+                for (line,) in plan:
+                    print(line)
+            print("---")
+    session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert N synthetic videos (and related rows) first")
+    parser.add_argument("--cleanup", action="store_true", help="delete the synthetic rows afterwards")
+    parser.add_argument("--no-analyze", action="store_true", help="plan only, do not execute the queries")
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        if args.seed:
+            seed(session, args.seed)
+            print(f"Seeded {args.seed} synthetic videos")
+        explain(analyze=not args.no_analyze)
+    finally:
+        if args.cleanup:
+            cleanup(session)
+            print("Removed synthetic rows")
+        session.close()
@@ -0,0 +1,115 @@
+"""
+Versioned schema migrations.
+
+Applied versions are recorded in the `schema_migrations` table. Each
+migration runs once, in version order, in its own transaction (the
+compression backfill commits per batch). Migrations must be idempotent so
+databases created before this table existed can be brought up to date:
+append new ones to MIGRATIONS, never edit or renumber applied ones.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Connection, Engine
+from .models import Base
+from .compress_text import COMPRESSED_COLUMNS, convert_column, compress_rows
+
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    # Receives the connection of the migration's transaction and the engine.
+    apply: Callable[[Connection, Engine], None]
+
+
+def _create_base_tables(conn: Connection, engine: Engine) -> None:
+    Base.metadata.create_all(conn, checkfirst=True)
+
+
+def _compress_text_columns(conn: Connection, engine: Engine) -> None:
+    for table, _, column in COMPRESSED_COLUMNS:
+        convert_column(conn, table, column)
+
+
+def _backfill_compressed_text(conn: Connection, engine: Engine) -> None:
+    for table, key, column in COMPRESSED_COLUMNS:
+        compress_rows(engine, table, key, column)
+
+
+HOT_QUERY_INDEXES = [
+    "ix_youtube_videos_published_at",
+    "ix_youtube_videos_channel_published",
+    "ix_youtube_videos_missing_transcript",
+    "ix_openai_articles_published_at",
+    "ix_anthropic_articles_published_at",
+    "ix_anthropic_articles_missing_markdown",
+    "ix_digests_article",
+    "ix_digests_created_at",
+    "ix_user_channels_channel_id",
+    "ix_user_subscriptions_status_expires",
+    "ix_transcript_attempts_next_retry_at",
+]
+
+
+def _create_hot_query_indexes(conn: Connection, engine: Engine) -> None:
+    """Secondary indexes declared on the models (see Repository for the queries they serve)."""
+    indexes = {
+        index.name: index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+    for name in HOT_QUERY_INDEXES:
+        indexes[name].create(conn, checkfirst=True)
+    for table in {indexes[name].table.name for name in HOT_QUERY_INDEXES}:
+        conn.exec_driver_sql(f"ANALYZE {table}")
+
+
+def _drop_redundant_digest_sends_index(conn: Connection, engine: Engine) -> None:
+    """uq_digest_user's unique index already covers (digest_id, user_id) lookups."""
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_digest_sends_user_digest")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create_base_tables", _create_base_tables),
+    Migration(2, "compress_text_columns", _compress_text_columns),
+    Migration(3, "backfill_compressed_text", _backfill_compressed_text),
+    Migration(4, "hot_query_indexes", _create_hot_query_indexes),
+    Migration(5, "drop_redundant_digest_sends_index", _drop_redundant_digest_sends_index),
+]
+
+
+def applied_versions(engine: Engine) -> set:
+    migration_metadata.create_all(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    """Apply pending migrations in order; returns the ones applied."""
+    done = applied_versions(engine)
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        with engine.begin() as conn:
+            migration.apply(conn, engine)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        print(f"Applied migration {migration.version:03d}_{migration.name}")
+        applied.append(migration)
+    return applied
@@ -1,9 +1,10 @@
 """ORM models used across scrapers, processors, and email services."""
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, Integer, Enum as SQLEnum, UniqueConstraint
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, String, DateTime, Text, Integer, Enum as SQLEnum, UniqueConstraint, Index, text
+from sqlalchemy.orm import declarative_base, deferred
 import enum
+from .types import CompressedText
 
 Base = declarative_base()
 
@@ -26,9 +27,33 @@ class YouTubeVideo(Base):
     channel_id = Column(String, nullable=False)
     published_at = Column(DateTime, nullable=False)
     description = Column(Text)
-    transcript = Column(Text, nullable=True)
+    # Compressed and only loaded when accessed; see app/database/compress_text.py.
+    transcript = deferred(Column(CompressedText, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_youtube_videos_published_at", "published_at"),
+        Index("ix_youtube_videos_channel_published", "channel_id", "published_at"),
+        # Transcript backlog scan; stays tiny because most rows have a transcript.
+        Index(
+            "ix_youtube_videos_missing_transcript",
+            "published_at",
+            postgresql_where=text("transcript IS NULL"),
+        ),
+    )
+
+
+class TranscriptAttempt(Base):
+    """Negative cache for transcript fetches that failed, with the next retry time."""
+
+    __tablename__ = "transcript_attempts"
+
+    video_id = Column(String, primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    last_attempt_at = Column(DateTime, nullable=True)
+    next_retry_at = Column(DateTime, nullable=False, index=True)
+
 
 class OpenAIArticle(Base):
     """OpenAI blog/news entry metadata."""
@@ -43,6 +68,10 @@ class OpenAIArticle(Base):
     category = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_openai_articles_published_at", "published_at"),
+    )
+
 
 class AnthropicArticle(Base):
     """Anthropic blog/research entry with optional markdown body."""
@@ -55,9 +84,18 @@ class AnthropicArticle(Base):
     description = Column(Text)
     published_at = Column(DateTime, nullable=False)
     category = Column(String, nullable=True)
-    markdown = Column(Text, nullable=True)
+    markdown = deferred(Column(CompressedText, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_anthropic_articles_published_at", "published_at"),
+        Index(
+            "ix_anthropic_articles_missing_markdown",
+            "published_at",
+            postgresql_where=text("markdown IS NULL"),
+        ),
+    )
+
 
 class Digest(Base):
     """LLM-generated summary for any source article."""
@@ -73,6 +111,12 @@ class Digest(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     sent_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        # Anti-join probe from each source table ("has this article a digest?").
+        Index("ix_digests_article", "article_type", "article_id"),
+        Index("ix_digests_created_at", "created_at"),
+    )
+
 
 class UserChannel(Base):
     """User-channel associations for YouTube channels."""
@@ -86,6 +130,7 @@ class UserChannel(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "channel_id", name="uq_user_channel"),
+        Index("ix_user_channels_channel_id", "channel_id"),
     )
 
 
@@ -103,6 +148,10 @@ class UserSubscription(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_user_subscriptions_status_expires", "subscription_status", "subscription_expires_at"),
+    )
+
 
 class DigestSend(Base):
     """Track which digests have been sent to which users."""
@@ -115,5 +164,6 @@ class DigestSend(Base):
     sent_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
+        # Its unique index also serves the per-user NOT EXISTS probe.
         UniqueConstraint("digest_id", "user_id", name="uq_digest_user"),
     )
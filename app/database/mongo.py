@@ -1,24 +1,103 @@
 """
 MongoDB connection helper for user auth/profile/channel storage.
 This does not affect the existing Postgres-backed pipeline.
+
+The API uses the async client (get_async_db); the pipeline's email stage
+keeps the sync one (get_db). Both share the pool settings below, which
+can be overridden with MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE and
+MONGO_MAX_IDLE_TIME_MS.
 """
 
+import logging
 import os
 from functools import lru_cache
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient, ASCENDING
+from pymongo.errors import OperationFailure
 
+logger = logging.getLogger(__name__)
 
-@lru_cache(maxsize=1)
-def get_mongo_client() -> MongoClient:
+
+def _mongo_url() -> str:
     mongo_url = os.getenv("MONGODB_URL")
     if not mongo_url:
         raise RuntimeError("MONGODB_URL is not configured")
-    return MongoClient(mongo_url, serverSelectionTimeoutMS=5000)
+    return mongo_url
+
+
+def get_client_options() -> dict:
+    """Connection pool options shared by the sync and async clients."""
+    return {
+        "serverSelectionTimeoutMS": 5000,
+        # Connections per server; API requests beyond this wait for a free one.
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+        # Kept open across idle periods so the first requests skip the TLS handshake.
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "2")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+    }
+
+
+def _db_name() -> str:
+    return os.getenv("MONGODB_DB", "ainotify")
+
+
+@lru_cache(maxsize=1)
+def get_mongo_client() -> MongoClient:
+    return MongoClient(_mongo_url(), **get_client_options())
 
 
 def get_db():
     client = get_mongo_client()
-    db_name = os.getenv("MONGODB_DB", "ainotify")
-    return client[db_name]
+    return client[_db_name()]
+
+
+@lru_cache(maxsize=1)
+def get_async_mongo_client() -> AsyncMongoClient:
+    """Process-wide async client; bound to the event loop that first uses it."""
+    return AsyncMongoClient(_mongo_url(), **get_client_options())
+
+
+def get_async_db():
+    return get_async_mongo_client()[_db_name()]
+
+
+async def close_async_mongo_client() -> None:
+    if get_async_mongo_client.cache_info().currsize:
+        await get_async_mongo_client().close()
+        get_async_mongo_client.cache_clear()
+
+
+# Server error codes for an existing index with the same name or keys but other options.
+INDEX_CONFLICT_CODES = {85, 86}
+
 
+async def ensure_indexes(db) -> bool:
+    """
+    Unique index on users.email (signup and login look users up by email);
+    idempotent, run at startup. Returns False when it could not be created.
 
+    A non-unique email index left by an earlier deployment is replaced. If
+    existing duplicate emails block the index, nothing is created: a
+    non-unique look-alike would hide the missing constraint.
+    """
+    users = db["users"]
+    for _ in range(2):
+        try:
+            await users.create_index([("email", ASCENDING)], unique=True, name="email_1")
+            return True
+        except OperationFailure as e:
+            if e.code in INDEX_CONFLICT_CODES:
+                indexes = await users.index_information()
+                stale = [
+                    name for name, spec in indexes.items()
+                    if spec["key"] == [("email", ASCENDING)] and not spec.get("unique")
+                ]
+                if stale:
+                    logger.warning(f"Replacing non-unique users.email index {stale[0]}: {e}")
+                    await users.drop_index(stale[0])
+                    continue
+            logger.error(
+                "Unique index on users.email NOT created, signup cannot rule out "
+                f"duplicate accounts until the duplicates are merged: {e}"
+            )
+            return False
+    return False
@@ -3,41 +3,141 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, exists, inspect, select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
 from .models import (
     YouTubeVideo, OpenAIArticle, AnthropicArticle, Digest,
-    UserChannel, UserSubscription, DigestSend, SubscriptionStatus
+    UserChannel, UserSubscription, DigestSend, SubscriptionStatus,
+    TranscriptAttempt,
 )
 from .connection import get_session
 
+# Rows per INSERT statement; keeps statements well under Postgres' 65535 bind-parameter cap.
+BULK_INSERT_CHUNK_SIZE = 500
+
+
+def subscription_status_summary(subscription: UserSubscription) -> Dict[str, Any]:
+    """Status dict for a subscription (shared with AsyncRepository)."""
+    # Subscription timestamps are stored as naive UTC.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    is_active = (
+        subscription.subscription_status == SubscriptionStatus.ACTIVE or
+        (
+            subscription.subscription_status == SubscriptionStatus.TRIAL and
+            subscription.subscription_expires_at and
+            subscription.subscription_expires_at > now
+        )
+    )
+
+    return {
+        "user_id": subscription.user_id,
+        "status": subscription.subscription_status.value,
+        "plan": subscription.subscription_plan,
+        "is_active": is_active,
+        "expires_at": subscription.subscription_expires_at.isoformat() if subscription.subscription_expires_at else None,
+    }
+
 
 class Repository:
     """CRUD helpers used by scrapers, processors, and email services."""
 
     def __init__(self, session: Optional[Session] = None):
+        # Only sessions created here are closed by close() / the context manager.
+        self._owns_session = session is None
         self.session = session or get_session()
 
+    @classmethod
+    def session_scope(cls) -> "Repository":
+        """
+        Repository on its own session, for use as a context manager:
+
+            with Repository.session_scope() as repo:
+                ...
+
+        One scope per unit of work (e.g. per worker task); sessions are not
+        thread-safe, so scopes must not be shared across threads.
+        """
+        return cls()
+
+    def close(self) -> None:
+        """Return the session's connection to the pool (no-op for borrowed sessions)."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "Repository":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.session.rollback()
+        self.close()
+
+    def _insert_ignoring_conflicts(
+        self,
+        model_class,
+        rows: List[dict],
+        returning=None,
+        constraint: Optional[str] = None,
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+    ) -> list:
+        """
+        INSERT ... ON CONFLICT DO NOTHING in chunks, letting the database skip
+        rows whose key (or the named unique `constraint`) already exists.
+        Rows may have different key sets: a multi-row VALUES needs one shape,
+        so rows are grouped by their keys and omitted columns keep their
+        defaults. Returns what RETURNING yields for the rows actually
+        inserted: primary-key values by default, or ORM objects when
+        `returning` is the model class. Does not commit.
+        """
+        if not rows:
+            return []
+        if returning is None:
+            returning = inspect(model_class).primary_key[0]
+        shapes: Dict[frozenset, List[dict]] = {}
+        for row in rows:
+            shapes.setdefault(frozenset(row), []).append(row)
+        inserted = []
+        for shaped_rows in shapes.values():
+            for start in range(0, len(shaped_rows), chunk_size):
+                stmt = (
+                    pg_insert(model_class)
+                    .values(shaped_rows[start:start + chunk_size])
+                    .on_conflict_do_nothing(constraint=constraint)
+                    .returning(returning)
+                )
+                inserted.extend(self.session.scalars(stmt).all())
+        return inserted
+
     def _bulk_create_items(
         self,
         items: List[dict],
         model_class,
         id_field: str,
-        id_attr: str,
     ) -> int:
-        """Insert multiple rows if they do not already exist."""
-        new_items = []
+        """Insert multiple rows if they do not already exist; returns rows inserted."""
+        # Duplicates within the batch are dropped here (the first one wins, as
+        # with existing rows), existing rows by the database.
+        unique_items: Dict[str, dict] = {}
         for item in items:
-            existing = (
-                self.session.query(model_class)
-                .filter_by(**{id_attr: item[id_field]})
-                .first()
-            )
-            if not existing:
-                new_items.append(model_class(**item))
-        if new_items:
-            self.session.add_all(new_items)
-            self.session.commit()
-        return len(new_items)
+            unique_items.setdefault(item[id_field], item)
+        inserted = self._insert_ignoring_conflicts(model_class, list(unique_items.values()))
+        self.session.commit()
+        return len(inserted)
+
+    def _existing_ids(self, model_class, id_field: str, ids: List[str]) -> Set[str]:
+        """Subset of `ids` that already has a row (primary-key lookups only)."""
+        column = getattr(model_class, id_field)
+        existing: Set[str] = set()
+        for start in range(0, len(ids), BULK_INSERT_CHUNK_SIZE):
+            chunk = ids[start:start + BULK_INSERT_CHUNK_SIZE]
+            existing.update(self.session.scalars(select(column).where(column.in_(chunk))))
+        return existing
+
+    def _create_item(self, model_class, **values):
+        """Insert one row unless its key exists; returns the new object or None."""
+        inserted = self._insert_ignoring_conflicts(model_class, [values], returning=model_class)
+        self.session.commit()
+        return inserted[0] if inserted else None
 
     def create_youtube_video(
         self,
@@ -49,10 +149,8 @@ class Repository:
         description: str = "",
         transcript: Optional[str] = None,
     ) -> Optional[YouTubeVideo]:
-        existing = self.session.query(YouTubeVideo).filter_by(video_id=video_id).first()
-        if existing:
-            return None
-        video = YouTubeVideo(
+        return self._create_item(
+            YouTubeVideo,
             video_id=video_id,
             title=title,
             url=url,
@@ -61,9 +159,6 @@ class Repository:
             description=description,
             transcript=transcript,
         )
-        self.session.add(video)
-        self.session.commit()
-        return video
 
     def create_openai_article(
         self,
@@ -74,10 +169,8 @@ class Repository:
         description: str = "",
         category: Optional[str] = None,
     ) -> Optional[OpenAIArticle]:
-        existing = self.session.query(OpenAIArticle).filter_by(guid=guid).first()
-        if existing:
-            return None
-        article = OpenAIArticle(
+        return self._create_item(
+            OpenAIArticle,
             guid=guid,
             title=title,
             url=url,
@@ -85,9 +178,6 @@ class Repository:
             description=description,
             category=category,
         )
-        self.session.add(article)
-        self.session.commit()
-        return article
 
     def create_anthropic_article(
         self,
@@ -98,10 +188,8 @@ class Repository:
         description: str = "",
         category: Optional[str] = None,
     ) -> Optional[AnthropicArticle]:
-        existing = self.session.query(AnthropicArticle).filter_by(guid=guid).first()
-        if existing:
-            return None
-        article = AnthropicArticle(
+        return self._create_item(
+            AnthropicArticle,
             guid=guid,
             title=title,
             url=url,
@@ -109,9 +197,6 @@ class Repository:
             description=description,
             category=category,
         )
-        self.session.add(article)
-        self.session.commit()
-        return article
 
     def bulk_create_youtube_videos(self, videos: List[dict]) -> int:
         formatted_videos = [
@@ -127,7 +212,7 @@ class Repository:
             for v in videos
         ]
         return self._bulk_create_items(
-            formatted_videos, YouTubeVideo, "video_id", "video_id"
+            formatted_videos, YouTubeVideo, "video_id"
         )
 
     def bulk_create_openai_articles(self, articles: List[dict]) -> int:
@@ -143,7 +228,7 @@ class Repository:
             for a in articles
         ]
         return self._bulk_create_items(
-            formatted_articles, OpenAIArticle, "guid", "guid"
+            formatted_articles, OpenAIArticle, "guid"
         )
 
     def bulk_create_anthropic_articles(self, articles: List[dict]) -> int:
@@ -159,14 +244,25 @@ class Repository:
             for a in articles
         ]
         return self._bulk_create_items(
-            formatted_articles, AnthropicArticle, "guid", "guid"
+            formatted_articles, AnthropicArticle, "guid"
         )
 
+    def get_existing_youtube_video_ids(self, video_ids: List[str]) -> Set[str]:
+        return self._existing_ids(YouTubeVideo, "video_id", video_ids)
+
+    def get_existing_openai_article_guids(self, guids: List[str]) -> Set[str]:
+        return self._existing_ids(OpenAIArticle, "guid", guids)
+
+    def get_existing_anthropic_article_guids(self, guids: List[str]) -> Set[str]:
+        return self._existing_ids(AnthropicArticle, "guid", guids)
+
     def get_anthropic_articles_without_markdown(
         self, limit: Optional[int] = None
     ) -> List[AnthropicArticle]:
-        query = self.session.query(AnthropicArticle).filter(
-            AnthropicArticle.markdown.is_(None)
+        query = (
+            self.session.query(AnthropicArticle)
+            .filter(AnthropicArticle.markdown.is_(None))
+            .order_by(AnthropicArticle.published_at.desc())
         )
         if limit:
             query = query.limit(limit)
@@ -183,8 +279,15 @@ class Repository:
     def get_youtube_videos_without_transcript(
         self, limit: Optional[int] = None
     ) -> List[YouTubeVideo]:
-        query = self.session.query(YouTubeVideo).filter(
-            YouTubeVideo.transcript.is_(None)
+        """Videos missing a transcript, minus those whose failed fetch is still backing off."""
+        backing_off = exists().where(
+            TranscriptAttempt.video_id == YouTubeVideo.video_id,
+            TranscriptAttempt.next_retry_at > datetime.now(timezone.utc),
+        )
+        query = (
+            self.session.query(YouTubeVideo)
+            .filter(YouTubeVideo.transcript.is_(None), ~backing_off)
+            .order_by(YouTubeVideo.published_at.desc())
         )
         if limit:
             query = query.limit(limit)
@@ -194,79 +297,107 @@ class Repository:
         video = self.session.query(YouTubeVideo).filter_by(video_id=video_id).first()
         if video:
             video.transcript = transcript
+            # The negative cache entry is no longer needed once the outcome is final.
+            self.session.query(TranscriptAttempt).filter_by(video_id=video_id).delete()
             self.session.commit()
             return True
         return False
 
+    def record_transcript_failure(
+        self,
+        video_id: str,
+        error: str,
+        base_delay: timedelta,
+        max_delay: timedelta,
+    ) -> TranscriptAttempt:
+        """Count a failed transcript fetch and schedule the next retry.
+
+        The delay doubles with each attempt (base_delay, 2x, 4x, ...) up to max_delay.
+        """
+        now = datetime.now(timezone.utc)
+        attempt = self.session.get(TranscriptAttempt, video_id)
+        if attempt is None:
+            attempt = TranscriptAttempt(video_id=video_id, attempts=0)
+            self.session.add(attempt)
+        attempt.attempts = (attempt.attempts or 0) + 1
+        attempt.last_error = error[:200]
+        attempt.last_attempt_at = now
+        attempt.next_retry_at = now + min(max_delay, base_delay * 2 ** (attempt.attempts - 1))
+        self.session.commit()
+        return attempt
+
     def get_articles_without_digest(
-        self, limit: Optional[int] = None
+        self, limit: Optional[int] = None, batch_size: int = 100
     ) -> List[Dict[str, Any]]:
-        articles = []
-        seen_ids = set()
-
-        digests = self.session.query(Digest).all()
-        for d in digests:
-            seen_ids.add(f"{d.article_type}:{d.article_id}")
+        """
+        Articles from every source that have no digest yet, newest first per source.
+
+        Each source is one NOT EXISTS anti-join against digests with the
+        ordering and the remaining limit applied in SQL; only the columns
+        needed downstream are selected and rows are streamed in batches.
+        """
+        sources = [
+            (
+                "youtube",
+                YouTubeVideo,
+                YouTubeVideo.video_id,
+                YouTubeVideo.transcript,
+                [
+                    YouTubeVideo.transcript.isnot(None),
+                    YouTubeVideo.transcript != "__UNAVAILABLE__",
+                ],
+            ),
+            ("openai", OpenAIArticle, OpenAIArticle.guid, None, []),
+            (
+                "anthropic",
+                AnthropicArticle,
+                AnthropicArticle.guid,
+                AnthropicArticle.markdown,
+                [AnthropicArticle.markdown.isnot(None)],
+            ),
+        ]
 
-        youtube_videos = (
-            self.session.query(YouTubeVideo)
-            .filter(
-                YouTubeVideo.transcript.isnot(None),
-                YouTubeVideo.transcript != "__UNAVAILABLE__",
+        articles = []
+        for article_type, model, id_column, content_column, filters in sources:
+            remaining = limit - len(articles) if limit else None
+            if remaining is not None and remaining <= 0:
+                break
+
+            has_digest = exists().where(
+                Digest.article_type == article_type,
+                Digest.article_id == id_column,
             )
-            .all()
-        )
-        for video in youtube_videos:
-            key = f"youtube:{video.video_id}"
-            if key not in seen_ids:
-                articles.append(
-                    {
-                        "type": "youtube",
-                        "id": video.video_id,
-                        "title": video.title,
-                        "url": video.url,
-                        "content": video.transcript or video.description or "",
-                        "published_at": video.published_at,
-                    }
-                )
-
-        openai_articles = self.session.query(OpenAIArticle).all()
-        for article in openai_articles:
-            key = f"openai:{article.guid}"
-            if key not in seen_ids:
-                articles.append(
-                    {
-                        "type": "openai",
-                        "id": article.guid,
-                        "title": article.title,
-                        "url": article.url,
-                        "content": article.description or "",
-                        "published_at": article.published_at,
-                    }
-                )
+            columns = [
+                id_column.label("id"),
+                model.title,
+                model.url,
+                model.description,
+                model.published_at,
+            ]
+            if content_column is not None:
+                columns.append(content_column.label("content"))
+            query = (
+                select(*columns)
+                .where(*filters, ~has_digest)
+                .order_by(model.published_at.desc())
+                .execution_options(yield_per=batch_size)
+            )
+            if remaining is not None:
+                query = query.limit(remaining)
 
-        anthropic_articles = (
-            self.session.query(AnthropicArticle)
-            .filter(AnthropicArticle.markdown.isnot(None))
-            .all()
-        )
-        for article in anthropic_articles:
-            key = f"anthropic:{article.guid}"
-            if key not in seen_ids:
+            for row in self.session.execute(query):
+                content = row.content if content_column is not None else None
                 articles.append(
                     {
-                        "type": "anthropic",
-                        "id": article.guid,
-                        "title": article.title,
-                        "url": article.url,
-                        "content": article.markdown or article.description or "",
-                        "published_at": article.published_at,
+                        "type": article_type,
+                        "id": row.id,
+                        "title": row.title,
+                        "url": row.url,
+                        "content": content or row.description or "",
+                        "published_at": row.published_at,
                     }
                 )
 
-        if limit:
-            articles = articles[:limit]
-
         return articles
 
     def create_digest(
@@ -428,53 +559,57 @@ class Repository:
         self.session.commit()
         return True
 
-    def get_active_users_with_channels(self) -> List[Dict[str, Any]]:
-        """Get all active users with their channel IDs."""
+    def get_active_users_with_channels(self, batch_size: int = 500) -> List[Dict[str, Any]]:
+        """Get all active users with their channel IDs.
+
+        One query: active subscriptions outer-joined to user_channels with the
+        channel IDs aggregated per user (array_agg), streamed in batches.
+        """
         now = datetime.now(timezone.utc)
-        active_subscriptions = self.session.query(UserSubscription).filter(
-            or_(
-                UserSubscription.subscription_status == SubscriptionStatus.ACTIVE,
-                and_(
-                    UserSubscription.subscription_status == SubscriptionStatus.TRIAL,
-                    UserSubscription.subscription_expires_at > now
+        channel_ids = func.array_remove(
+            func.array_agg(aggregate_order_by(UserChannel.channel_id, UserChannel.channel_id)),
+            None,
+        )
+        query = (
+            select(
+                UserSubscription.user_id,
+                UserSubscription.subscription_status,
+                UserSubscription.subscription_plan,
+                channel_ids.label("channel_ids"),
+            )
+            .outerjoin(UserChannel, UserChannel.user_id == UserSubscription.user_id)
+            .where(
+                or_(
+                    UserSubscription.subscription_status == SubscriptionStatus.ACTIVE,
+                    and_(
+                        UserSubscription.subscription_status == SubscriptionStatus.TRIAL,
+                        UserSubscription.subscription_expires_at > now
+                    )
                 )
             )
-        ).all()
-        
-        result = []
-        for sub in active_subscriptions:
-            channels = self.get_user_channels(sub.user_id)
-            result.append({
-                "user_id": sub.user_id,
-                "subscription_status": sub.subscription_status.value,
-                "subscription_plan": sub.subscription_plan,
-                "channel_ids": channels,
-            })
-        return result
+            .group_by(
+                UserSubscription.user_id,
+                UserSubscription.subscription_status,
+                UserSubscription.subscription_plan,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        return [
+            {
+                "user_id": row.user_id,
+                "subscription_status": row.subscription_status.value,
+                "subscription_plan": row.subscription_plan,
+                "channel_ids": list(row.channel_ids or []),
+            }
+            for row in self.session.execute(query)
+        ]
 
     def check_subscription_status(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Check if user subscription is active."""
         subscription = self.get_user_subscription(user_id)
         if not subscription:
             return None
-        
-        now = datetime.now(timezone.utc)
-        is_active = (
-            subscription.subscription_status == SubscriptionStatus.ACTIVE or
-            (
-                subscription.subscription_status == SubscriptionStatus.TRIAL and
-                subscription.subscription_expires_at and
-                subscription.subscription_expires_at > now
-            )
-        )
-        
-        return {
-            "user_id": subscription.user_id,
-            "status": subscription.subscription_status.value,
-            "plan": subscription.subscription_plan,
-            "is_active": is_active,
-            "expires_at": subscription.subscription_expires_at.isoformat() if subscription.subscription_expires_at else None,
-        }
+        return subscription_status_summary(subscription)
 
     # User-specific Digest Operations
     def get_recent_digests_for_user(
@@ -483,85 +618,59 @@ class Repository:
         channel_ids: List[str],
         hours: int = 24
     ) -> List[Dict[str, Any]]:
-        """Get recent digests for a user, filtering YouTube videos by their channels."""
+        """Get recent digests for a user, filtering YouTube videos by their channels.
+
+        One query: digests inside the time window that were not sent to the
+        user yet (NOT EXISTS on digest_sends), keeping YouTube digests only
+        when the video belongs to one of the user's channels.
+        """
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-        
-        # Get all digests that haven't been sent to this user
-        sent_digest_ids = {
-            ds.digest_id
-            for ds in self.session.query(DigestSend.digest_id).filter(
-                DigestSend.user_id == user_id
-            ).all()
-        }
-        
-        # Get YouTube videos for user's channels
+
+        already_sent = exists().where(
+            DigestSend.digest_id == Digest.id,
+            DigestSend.user_id == user_id,
+        )
+        source_filter = Digest.article_type.in_(["openai", "anthropic"])
         if channel_ids:
-            youtube_videos = self.session.query(YouTubeVideo).filter(
-                YouTubeVideo.channel_id.in_(channel_ids)
-            ).all()
-            youtube_video_ids = {v.video_id for v in youtube_videos}
-        else:
-            youtube_video_ids = set()
-        
-        # Get YouTube digests filtered by user's channels
-        youtube_digest_ids = {f"youtube:{vid}" for vid in youtube_video_ids}
-        youtube_digests = []
-        if youtube_digest_ids:
-            youtube_digests = self.session.query(Digest).filter(
-                and_(
-                    Digest.article_type == "youtube",
-                    Digest.created_at >= cutoff_time,
-                    Digest.id.in_(youtube_digest_ids),
-                    ~Digest.id.in_(sent_digest_ids) if sent_digest_ids else True
-                )
-            ).all()
-        
-        # Get OpenAI and Anthropic digests (shared for all users)
-        other_digests = self.session.query(Digest).filter(
-            and_(
-                Digest.article_type.in_(["openai", "anthropic"]),
-                Digest.created_at >= cutoff_time,
-                ~Digest.id.in_(sent_digest_ids) if sent_digest_ids else True
+            from_user_channel = exists().where(
+                YouTubeVideo.video_id == Digest.article_id,
+                YouTubeVideo.channel_id.in_(channel_ids),
             )
-        ).all()
-        
-        all_digests = list(youtube_digests) + list(other_digests)
-        
-        return [
-            {
-                "id": d.id,
-                "article_type": d.article_type,
-                "article_id": d.article_id,
-                "url": d.url,
-                "title": d.title,
-                "summary": d.summary,
-                "created_at": d.created_at,
-            }
-            for d in all_digests
-        ]
+            source_filter = or_(
+                source_filter,
+                and_(Digest.article_type == "youtube", from_user_channel),
+            )
+
+        query = (
+            select(
+                Digest.id,
+                Digest.article_type,
+                Digest.article_id,
+                Digest.url,
+                Digest.title,
+                Digest.summary,
+                Digest.created_at,
+            )
+            .where(Digest.created_at >= cutoff_time, source_filter, ~already_sent)
+            .order_by(Digest.created_at.desc())
+        )
+        return [dict(row._mapping) for row in self.session.execute(query)]
 
     def mark_digests_as_sent_for_user(self, user_id: str, digest_ids: List[str]) -> int:
         """Mark digests as sent for a specific user."""
+        return self.mark_digests_as_sent_for_users({user_id: digest_ids})
+
+    def mark_digests_as_sent_for_users(self, sends: Dict[str, List[str]]) -> int:
+        """Record sends for many users in one multi-row insert; returns rows added.
+
+        Pairs that were already recorded are skipped by the uq_digest_user constraint.
+        """
         sent_time = datetime.now(timezone.utc)
-        count = 0
-        
-        for digest_id in digest_ids:
-            # Check if already sent
-            existing = self.session.query(DigestSend).filter(
-                and_(
-                    DigestSend.digest_id == digest_id,
-                    DigestSend.user_id == user_id
-                )
-            ).first()
-            
-            if not existing:
-                digest_send = DigestSend(
-                    digest_id=digest_id,
-                    user_id=user_id,
-                    sent_at=sent_time
-                )
-                self.session.add(digest_send)
-                count += 1
-        
+        rows = [
+            {"digest_id": digest_id, "user_id": user_id, "sent_at": sent_time}
+            for user_id, digest_ids in sends.items()
+            for digest_id in dict.fromkeys(digest_ids)
+        ]
+        inserted = self._insert_ignoring_conflicts(DigestSend, rows, constraint="uq_digest_user")
         self.session.commit()
-        return count
+        return len(inserted)
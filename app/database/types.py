@@ -0,0 +1,56 @@
+"""Custom column types."""
+
+import zlib
+from typing import Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+# One header byte tells how the rest of the value is encoded.
+RAW_HEADER = b"\x00"
+ZLIB_HEADER = b"\x01"
+# Short values rarely shrink enough to be worth the CPU.
+COMPRESSION_MIN_BYTES = 512
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(value: str) -> bytes:
+    """Encode text for storage; the same input always yields the same bytes."""
+    raw = value.encode("utf-8")
+    if len(raw) >= COMPRESSION_MIN_BYTES:
+        compressed = zlib.compress(raw, COMPRESSION_LEVEL)
+        if len(compressed) < len(raw):
+            return ZLIB_HEADER + compressed
+    return RAW_HEADER + raw
+
+
+def decompress_text(value: bytes) -> str:
+    value = bytes(value)
+    header, body = value[:1], value[1:]
+    if header == ZLIB_HEADER:
+        return zlib.decompress(body).decode("utf-8")
+    if header == RAW_HEADER:
+        return body.decode("utf-8")
+    raise ValueError(f"Unknown compressed text header: {header!r}")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored as zlib-compressed bytes (bytea on Postgres).
+
+    Encoding is deterministic, so equality filters against literals (such as
+    the transcript-unavailable marker) still work. Pair with deferred() so
+    the blob is only fetched and decompressed when the attribute is read.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -0,0 +1,93 @@
+"""Process-wide pooled HTTP transport shared by scrapers, processors and agents."""
+
+import logging
+from functools import lru_cache
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .config import (
+    HTTP_TIMEOUT,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP2_ENABLED,
+    LLM_HTTP_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Only transient upstream failures are retried here; 429s are left to callers
+# that implement their own backoff (e.g. the transcript stage).
+RETRY_STATUSES = (502, 503, 504)
+
+
+def _retry_policy() -> Retry:
+    return Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def get_http_session(name: str = "default") -> requests.Session:
+    """
+    Return the shared keep-alive session for `name`.
+
+    Each session keeps a connection pool per host (HTTP_POOL_MAXSIZE sockets
+    each), so repeated requests reuse TLS connections. Use a separate name
+    when a client mutates session state, e.g. proxies for transcripts.
+    """
+    return _build_session(name)
+
+
+@lru_cache(maxsize=None)
+def _build_session(name: str) -> requests.Session:
+    return new_http_session()
+
+
+def new_http_session() -> requests.Session:
+    """
+    Unshared session with the same headers, pool size and retry policy, for
+    clients that must not share one across threads (transcript fetchers).
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_MAXSIZE,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=_retry_policy(),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def get_httpx_client() -> httpx.Client:
+    """Shared httpx client (used by the Groq SDK) with keep-alive and optional HTTP/2."""
+    http2 = _http2_available()
+    limits = httpx.Limits(
+        max_connections=HTTP_POOL_MAXSIZE * 2,
+        max_keepalive_connections=HTTP_POOL_MAXSIZE,
+    )
+    return httpx.Client(
+        timeout=httpx.Timeout(LLM_HTTP_TIMEOUT, connect=HTTP_TIMEOUT),
+        transport=httpx.HTTPTransport(http2=http2, limits=limits, retries=HTTP_MAX_RETRIES),
+    )
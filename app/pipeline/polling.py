@@ -0,0 +1,125 @@
+"""Adaptive per-feed polling cadence learned from publication history."""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from pydantic import BaseModel, Field
+from app.config import (
+    POLL_MIN_INTERVAL_HOURS,
+    POLL_MAX_INTERVAL_HOURS,
+    POLL_TARGET_ENTRIES,
+)
+from app.storage import state_path, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Publish timestamps remembered per feed, and how far back they count
+# towards the rate estimate.
+HISTORY_SIZE = 50
+RATE_WINDOW = timedelta(days=30)
+# Extra lookback past the last poll, for clock skew and feeds that backdate entries.
+LOOKBACK_MARGIN = timedelta(hours=1)
+
+
+class FeedHistory(BaseModel):
+    """Observed publish times and poll bookkeeping for one feed or channel."""
+
+    entry_times: List[datetime] = Field(default_factory=list)
+    last_polled_at: Optional[datetime] = None
+    next_poll_at: Optional[datetime] = None
+
+
+class PollScheduler:
+    """
+    Decides which feeds are worth fetching on this run.
+
+    Feeds are keyed by URL (RSS) or "youtube:<channel_id>". A feed with no
+    history is always due. After each poll the publishing rate is estimated
+    from recent entry timestamps and the next poll is scheduled after
+    POLL_TARGET_ENTRIES / rate hours, clamped to [min_interval, max_interval].
+
+    A skipped feed is fetched later than the run's lookback window assumes,
+    so scrapers must ask lookback_hours() how far back to read each feed;
+    it reaches back to the previous poll, so no entry falls into the gap.
+    """
+
+    def __init__(
+        self,
+        min_interval_hours: float = POLL_MIN_INTERVAL_HOURS,
+        max_interval_hours: float = POLL_MAX_INTERVAL_HOURS,
+        target_entries: float = POLL_TARGET_ENTRIES,
+        name: str = "schedule",
+    ):
+        self.min_interval = timedelta(hours=min_interval_hours)
+        self.max_interval = timedelta(hours=max(min_interval_hours, max_interval_hours))
+        self.target_entries = target_entries
+        self.path = state_path("polling", f"{name}.json")
+        self._lock = threading.Lock()
+        self._histories: Dict[str, FeedHistory] = {}
+        for key, data in (read_json(self.path) or {}).items():
+            try:
+                self._histories[key] = FeedHistory(**data)
+            except ValueError:
+                continue
+
+    def is_due(self, key: str, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            history = self._histories.get(key)
+        return history is None or history.next_poll_at is None or history.next_poll_at <= now
+
+    def due(self, keys: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+        """Filter keys down to the ones that should be fetched now."""
+        now = now or datetime.now(timezone.utc)
+        keys = list(keys)
+        due_keys = [key for key in keys if self.is_due(key, now)]
+        if len(due_keys) < len(keys):
+            logger.info(f"Adaptive polling: {len(keys) - len(due_keys)}/{len(keys)} feeds not due yet")
+        return due_keys
+
+    def lookback_hours(self, key: str, hours: float, now: Optional[datetime] = None) -> float:
+        """Hours of entries to read for a feed: `hours`, or back to its last poll if longer."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            history = self._histories.get(key)
+        if history is None or history.last_polled_at is None:
+            return hours
+        since_last_poll = now - history.last_polled_at + LOOKBACK_MARGIN
+        return max(hours, since_last_poll.total_seconds() / 3600)
+
+    def estimate_rate(self, history: FeedHistory, now: datetime) -> float:
+        """Entries per hour over the recent window (0 when nothing was published)."""
+        recent = [t for t in history.entry_times if t >= now - RATE_WINDOW]
+        if not recent:
+            return 0.0
+        span_hours = max((now - min(recent)).total_seconds() / 3600, 24.0)
+        return len(recent) / span_hours
+
+    def record(
+        self, key: str, published_times: Iterable[datetime], now: Optional[datetime] = None
+    ) -> datetime:
+        """Store a successful poll and return when the feed should be polled next."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            history = self._histories.get(key) or FeedHistory()
+            times = set(history.entry_times)
+            times.update(t if t.tzinfo else t.replace(tzinfo=timezone.utc) for t in published_times)
+            history.entry_times = sorted(times)[-HISTORY_SIZE:]
+
+            rate = self.estimate_rate(history, now)
+            if rate > 0:
+                interval = timedelta(hours=self.target_entries / rate)
+                interval = min(max(interval, self.min_interval), self.max_interval)
+            else:
+                interval = self.max_interval
+
+            history.last_polled_at = now
+            history.next_poll_at = now + interval
+            self._histories[key] = history
+            return history.next_poll_at
+
+    def save(self) -> None:
+        with self._lock:
+            data = {key: h.model_dump(mode="json") for key, h in self._histories.items()}
+        write_json_atomic(self.path, data)
@@ -1,63 +1,149 @@
 """Helper utilities to run all scrapers and persist raw content."""
 
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Callable, Any, Optional
-from .config import YOUTUBE_CHANNELS
+from .config import (
+    YOUTUBE_CHANNELS,
+    YOUTUBE_SCRAPE_WORKERS,
+    YOUTUBE_INSERT_BATCH_SIZE,
+    POLL_ADAPTIVE_ENABLED,
+    POLL_MAX_INTERVAL_HOURS,
+    FEED_SNAPSHOT_ENABLED,
+)
 from .scrapers.youtube import YouTubeScraper, ChannelVideo
 from .scrapers.openai import OpenAIScraper
 from .scrapers.anthropic import AnthropicScraper
+from .scrapers.snapshot import FeedSnapshot
 from .database.repository import Repository
+from .pipeline.polling import PollScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def _video_to_dict(video: ChannelVideo, channel_id: str) -> dict:
+    """Shape a scraped video into the row dict expected by the repository."""
+    return {
+        "video_id": video.video_id,
+        "title": video.title,
+        "url": video.url,
+        "channel_id": channel_id,
+        "published_at": video.published_at,
+        "description": video.description,
+        "transcript": video.transcript,
+    }
+
+
+def _channel_key(channel_id: str) -> str:
+    """Polling-schedule key for a YouTube channel."""
+    return f"youtube:{channel_id}"
 
 
 def _save_youtube_videos(
-    scraper: YouTubeScraper, repo: Repository, hours: int, channel_ids: List[str] = None
+    scraper: YouTubeScraper,
+    repo: Repository,
+    hours: int,
+    channel_ids: List[str] = None,
+    max_workers: int = YOUTUBE_SCRAPE_WORKERS,
+    batch_size: int = YOUTUBE_INSERT_BATCH_SIZE,
+    poll_scheduler: Optional[PollScheduler] = None,
+    snapshot: Optional[FeedSnapshot] = None,
 ) -> List[ChannelVideo]:
     """
     Fetch and persist the latest YouTube videos for specified channels.
 
+    Channels are scraped concurrently; videos are flushed to the database in
+    batches as channel results arrive, and a failing channel is logged and
+    skipped without affecting the others.
+
     Args:
         scraper (YouTubeScraper): An instance of the YouTubeScraper class. This is a user-defined type.
         repo (Repository): An instance of the Repository class for database operations. This is a user-defined type.
         hours (int): The number of hours to look back for new videos. This is a built-in integer type.
         channel_ids (List[str]): List of YouTube channel IDs to scrape. If None, uses YOUTUBE_CHANNELS from config.
+        max_workers (int): Number of channels scraped in parallel.
+        batch_size (int): Number of videos buffered before each bulk insert.
+        poll_scheduler (PollScheduler, optional): When given, only channels that are due are scraped,
+            each looking back to its previous poll if that is further than `hours`.
+        snapshot (FeedSnapshot, optional): When given, videos persisted by earlier runs are skipped.
 
     Returns:
         List[ChannelVideo]: A list of ChannelVideo objects that were saved. This is a user-defined type.
     """
     videos = []
     video_dicts = []
-    
+    failed_channels = []
+    polled = []
+
     # Use provided channel_ids or fall back to config
     channels_to_scrape = channel_ids if channel_ids else YOUTUBE_CHANNELS
-    
-    # This loop iterates through the list of YouTube channel IDs.
-    for channel_id in channels_to_scrape:
-        # This is a user-defined method from the YouTubeScraper class.
-        # It fetches the latest videos for a given channel.
-        channel_videos = scraper.get_latest_videos(channel_id, hours=hours)
-        videos.extend(channel_videos)
-        video_dicts.extend(
-            [
-                {
-                    "video_id": v.video_id,
-                    "title": v.title,
-                    "url": v.url,
-                    "channel_id": channel_id,
-                    "published_at": v.published_at,
-                    "description": v.description,
-                    "transcript": v.transcript,
-                }
-                for v in channel_videos
-            ]
+    if poll_scheduler:
+        due_keys = set(poll_scheduler.due(_channel_key(c) for c in channels_to_scrape))
+        channels_to_scrape = [c for c in channels_to_scrape if _channel_key(c) in due_keys]
+    if not channels_to_scrape:
+        return videos
+
+    def flush():
+        # The repository session is not thread-safe, so inserts always happen
+        # on this thread while the pool keeps fetching.
+        if video_dicts:
+            repo.bulk_create_youtube_videos(video_dicts)
+            if snapshot:
+                snapshot.mark_seen(v["video_id"] for v in video_dicts)
+            video_dicts.clear()
+        # Only count a channel as polled once its videos are persisted.
+        if poll_scheduler:
+            for polled_channel, published_times in polled:
+                poll_scheduler.record(_channel_key(polled_channel), published_times)
+        polled.clear()
+
+    def lookback(channel_id: str) -> float:
+        if poll_scheduler:
+            return poll_scheduler.lookback_hours(_channel_key(channel_id), hours)
+        return hours
+
+    workers = max(1, min(max_workers, len(channels_to_scrape)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        future_to_channel = {
+            executor.submit(scraper.get_latest_videos, channel_id, lookback(channel_id)): channel_id
+            for channel_id in channels_to_scrape
+        }
+        for future in as_completed(future_to_channel):
+            channel_id = future_to_channel[future]
+            try:
+                channel_videos = future.result()
+            except Exception as e:
+                failed_channels.append(channel_id)
+                logger.warning(f"Error scraping YouTube channel {channel_id}: {e}")
+                continue
+
+            polled.append((channel_id, [v.published_at for v in channel_videos]))
+            if snapshot:
+                channel_videos = snapshot.filter_new(
+                    channel_videos,
+                    key=lambda v: v.video_id,
+                    exists=repo.get_existing_youtube_video_ids,
+                )
+            videos.extend(channel_videos)
+            video_dicts.extend(_video_to_dict(v, channel_id) for v in channel_videos)
+            if len(video_dicts) >= batch_size:
+                flush()
+
+    flush()
+    if failed_channels:
+        logger.warning(
+            f"{len(failed_channels)}/{len(channels_to_scrape)} YouTube channels failed to scrape"
         )
-    if video_dicts:
-        # This is a user-defined method from the Repository class.
-        # It bulk saves the YouTube videos to the database.
-        repo.bulk_create_youtube_videos(video_dicts)
     return videos
 
 
 def _save_rss_articles(
-    scraper, repo: Repository, hours: int, save_func: Callable
+    scraper,
+    repo: Repository,
+    hours: int,
+    save_func: Callable,
+    snapshot: Optional[FeedSnapshot] = None,
+    exists_func: Optional[Callable] = None,
 ) -> List[Any]:
     """
     Fetch items from an RSS scraper and persist them using a provided saver.
@@ -67,6 +153,9 @@ def _save_rss_articles(
         repo (Repository): An instance of the Repository class for database operations. This is a user-defined type.
         hours (int): The number of hours to look back for new articles. This is a built-in integer type.
         save_func (Callable): The function to call to save the articles to the database. This is a built-in callable type.
+        snapshot (FeedSnapshot, optional): When given, articles persisted by earlier runs are skipped.
+        exists_func (Callable, optional): Returns the given GUIDs that are in the database;
+            required with `snapshot`, which only skips articles it confirms.
 
     Returns:
         List[Any]: A list of article objects that were saved.
@@ -74,6 +163,8 @@ def _save_rss_articles(
     # This is a user-defined method from the scraper instance.
     # It fetches the latest articles from the RSS feed.
     articles = scraper.get_articles(hours=hours)
+    if snapshot:
+        articles = snapshot.filter_new(articles, key=lambda a: a.guid, exists=exists_func)
     if articles:
         article_dicts = [
             {
@@ -88,9 +179,31 @@ def _save_rss_articles(
         ]
         # This calls the provided save function to save the articles to the database.
         save_func(article_dicts)
+        if snapshot:
+            snapshot.mark_seen(a.guid for a in articles)
     return articles
 
 
+def _poll_scheduler(source: str, hours: int) -> Optional[PollScheduler]:
+    """
+    Build the adaptive polling schedule for a source.
+
+    The longest poll interval is capped at the lookback window to bound how
+    stale a quiet feed gets. Feeds polled later than that (a run landing just
+    before next_poll_at defers them to the next run) are read back to their
+    previous poll via PollScheduler.lookback_hours, so no entries are lost.
+    The schedule is only saved after the source's items are persisted.
+    """
+    if not POLL_ADAPTIVE_ENABLED:
+        return None
+    return PollScheduler(max_interval_hours=min(POLL_MAX_INTERVAL_HOURS, hours), name=source)
+
+
+def _snapshot(source: str) -> Optional[FeedSnapshot]:
+    """Seen-ID snapshot for a source, or None when snapshot diffing is disabled."""
+    return FeedSnapshot(source) if FEED_SNAPSHOT_ENABLED else None
+
+
 def run_scrapers(hours: int = 24, channel_ids: Optional[List[str]] = None) -> dict:
     """
     This user-defined function runs all the scrapers.
@@ -109,7 +222,23 @@ def run_scrapers(hours: int = 24, channel_ids: Optional[List[str]] = None) -> di
     # Run YouTube scraper with specified channels
     try:
         youtube_scraper = YouTubeScraper()
-        youtube_videos = _save_youtube_videos(youtube_scraper, repo, hours, channel_ids)
+        youtube_schedule = _poll_scheduler("youtube", hours)
+        youtube_snapshot = _snapshot("youtube")
+        try:
+            youtube_videos = _save_youtube_videos(
+                youtube_scraper,
+                repo,
+                hours,
+                channel_ids,
+                poll_scheduler=youtube_schedule,
+                snapshot=youtube_snapshot,
+            )
+        finally:
+            # Batches flushed before a failure are already in the database.
+            if youtube_snapshot:
+                youtube_snapshot.save()
+        if youtube_schedule:
+            youtube_schedule.save()
         results["youtube"] = youtube_videos
     except Exception as e:
         results["youtube"] = []
@@ -118,9 +247,20 @@ def run_scrapers(hours: int = 24, channel_ids: Optional[List[str]] = None) -> di
     # Run OpenAI scraper
     try:
         openai_scraper = OpenAIScraper()
+        openai_scraper.poll_scheduler = _poll_scheduler("openai", hours)
+        openai_snapshot = _snapshot("openai")
         openai_articles = _save_rss_articles(
-            openai_scraper, repo, hours, repo.bulk_create_openai_articles
+            openai_scraper,
+            repo,
+            hours,
+            repo.bulk_create_openai_articles,
+            snapshot=openai_snapshot,
+            exists_func=repo.get_existing_openai_article_guids,
         )
+        if openai_snapshot:
+            openai_snapshot.save()
+        if openai_scraper.poll_scheduler:
+            openai_scraper.poll_scheduler.save()
         results["openai"] = openai_articles
     except Exception as e:
         results["openai"] = []
@@ -129,9 +269,20 @@ def run_scrapers(hours: int = 24, channel_ids: Optional[List[str]] = None) -> di
     # Run Anthropic scraper
     try:
         anthropic_scraper = AnthropicScraper()
+        anthropic_scraper.poll_scheduler = _poll_scheduler("anthropic", hours)
+        anthropic_snapshot = _snapshot("anthropic")
         anthropic_articles = _save_rss_articles(
-            anthropic_scraper, repo, hours, repo.bulk_create_anthropic_articles
+            anthropic_scraper,
+            repo,
+            hours,
+            repo.bulk_create_anthropic_articles,
+            snapshot=anthropic_snapshot,
+            exists_func=repo.get_existing_anthropic_article_guids,
         )
+        if anthropic_snapshot:
+            anthropic_snapshot.save()
+        if anthropic_scraper.poll_scheduler:
+            anthropic_scraper.poll_scheduler.save()
         results["anthropic"] = anthropic_articles
     except Exception as e:
         results["anthropic"] = []
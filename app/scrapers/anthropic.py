@@ -1,9 +1,22 @@
 """Scraper for Anthropic blog/research RSS feeds."""
 
+from datetime import timedelta
 from typing import List, Optional
-import requests
 from html_to_markdown import convert
+from ..config import (
+    CONTENT_CACHE_ENABLED,
+    CONTENT_CACHE_MAX_MB,
+    CONTENT_CACHE_TTL_HOURS,
+    HTTP_TIMEOUT,
+    ANTHROPIC_MARKDOWN_MAX_CHARS,
+)
+from ..http_client import get_http_session
 from .base import BaseScraper, Article
+from .content_cache import ContentCache
+from .extract import extract_main_content, truncate_markdown
+
+# Version of the HTML -> markdown pipeline; bump to invalidate cached markdown.
+MARKDOWN_VERSION = "2"
 
 
 class AnthropicArticle(Article):
@@ -11,6 +24,18 @@ class AnthropicArticle(Article):
 
 
 class AnthropicScraper(BaseScraper):
+    def __init__(self):
+        super().__init__()
+        self.content_cache = (
+            ContentCache(
+                max_bytes=CONTENT_CACHE_MAX_MB * 1024 * 1024,
+                markdown_version=MARKDOWN_VERSION,
+            )
+            if CONTENT_CACHE_ENABLED
+            else None
+        )
+        self.content_max_age = timedelta(hours=CONTENT_CACHE_TTL_HOURS)
+
     @property
     def rss_urls(self) -> List[str]:
         return [
@@ -27,17 +52,69 @@ class AnthropicScraper(BaseScraper):
         ]
 
     def url_to_markdown(self, url: str) -> Optional[str]:
-        """Fetch article HTML and convert it to markdown for downstream summarization."""
+        """Fetch article HTML and convert it to markdown for downstream summarization.
+
+        Fresh cache hits skip the network entirely; stale ones are revalidated
+        with a conditional GET, and a cached copy is served if the fetch fails.
+        """
+        cache = self.content_cache
+        entry = cache.lookup(url) if cache else None
+        if entry and entry.is_fresh(self.content_max_age):
+            markdown = self._cached_markdown(entry.key)
+            if markdown is not None:
+                return markdown
+
+        session = get_http_session()
         try:
-            response = requests.get(
-                url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30
-            )
+            headers = cache.conditional_headers(entry) if cache else {}
+            response = session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+
+            if response.status_code == 304 and entry:
+                markdown = self._cached_markdown(entry.key)
+                if markdown is not None:
+                    cache.touch(url, entry.key, entry.etag, entry.last_modified)
+                    return markdown
+                # Blobs were evicted: fetch again without validators.
+                response = session.get(url, timeout=HTTP_TIMEOUT)
+
             response.raise_for_status()
             html = response.text
-            markdown = convert(html)
+            if not cache:
+                return self.html_to_markdown(html)
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            key = cache.make_key(url, etag or last_modified or cache.body_digest(html))
+            markdown = cache.get_markdown(key)
+            if markdown is None:
+                markdown = self.html_to_markdown(html)
+                cache.put(url, key, html, markdown, etag, last_modified)
+            else:
+                cache.touch(url, key, etag, last_modified)
             return markdown
         except Exception:
+            if entry:
+                return self._cached_markdown(entry.key)
+            return None
+
+    def _cached_markdown(self, key: str) -> Optional[str]:
+        """Cached markdown, re-deriving it from cached HTML when only that survived."""
+        markdown = self.content_cache.get_markdown(key)
+        if markdown is not None:
+            return markdown
+        html = self.content_cache.get_html(key)
+        if html is None:
             return None
+        markdown = self.html_to_markdown(html)
+        self.content_cache.put_markdown(key, markdown)
+        return markdown
+
+    @staticmethod
+    def html_to_markdown(html: str) -> str:
+        """Strip page chrome, keep the article body, convert and cap its size."""
+        return truncate_markdown(
+            convert(extract_main_content(html)), ANTHROPIC_MARKDOWN_MAX_CHARS
+        )
 
 
 if __name__ == "__main__":
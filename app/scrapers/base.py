@@ -3,8 +3,17 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from abc import ABC, abstractmethod
-import feedparser
 from pydantic import BaseModel
+from ..config import (
+    FEED_FETCH_TIMEOUT,
+    FEED_FETCH_CONCURRENCY,
+    FEED_CACHE_ENABLED,
+    FEED_MAX_ENTRIES,
+)
+from .fetch import FeedFetcher, FetchResult
+from .feed_cache import FeedCache, CachedFeed
+from .stream_parser import FeedEntry, parse_feed
+from ..pipeline.polling import PollScheduler
 
 
 class Article(BaseModel):
@@ -19,6 +28,19 @@ class Article(BaseModel):
 
 
 class BaseScraper(ABC):
+    fetch_timeout: float = FEED_FETCH_TIMEOUT
+    max_concurrency: int = FEED_FETCH_CONCURRENCY
+    max_entries: int = FEED_MAX_ENTRIES
+
+    def __init__(self):
+        self.fetcher = FeedFetcher(
+            timeout=self.fetch_timeout, max_workers=self.max_concurrency
+        )
+        self.feed_cache = FeedCache() if FEED_CACHE_ENABLED else None
+        # Optional: when set, only feeds that are due get fetched.
+        self.poll_scheduler: Optional[PollScheduler] = None
+        self.last_fetch_results: List[FetchResult] = []
+
     @property
     @abstractmethod
     def rss_urls(self) -> List[str]:
@@ -26,38 +48,87 @@ class BaseScraper(ABC):
         pass
 
     def get_articles(self, hours: int = 24) -> List[Article]:
-        """Return deduplicated RSS entries newer than the lookback window."""
+        """
+        Return deduplicated RSS entries newer than the lookback window.
+
+        With a poll scheduler, a feed that was skipped on earlier runs is
+        read back to its previous poll instead of just `hours`.
+        """
         now = datetime.now(timezone.utc)
-        cutoff_time = now - timedelta(hours=hours)
         articles = []
         seen_guids = set()
 
-        for rss_url in self.rss_urls:
-            feed = feedparser.parse(rss_url)
-            if not feed.entries:
-                continue
-
-            for entry in feed.entries:
-                published_parsed = getattr(entry, "published_parsed", None)
-                if not published_parsed:
-                    continue
-
-                published_time = datetime(*published_parsed[:6], tzinfo=timezone.utc)
-                if published_time >= cutoff_time:
-                    guid = entry.get("id", entry.get("link", ""))
-                    if guid not in seen_guids:
-                        seen_guids.add(guid)
-                        articles.append(
-                            Article(
-                                title=entry.get("title", ""),
-                                description=entry.get("description", ""),
-                                url=entry.get("link", ""),
-                                guid=guid,
-                                published_at=published_time,
-                                category=entry.get("tags", [{}])[0].get("term")
-                                if entry.get("tags")
-                                else None,
-                            )
-                        )
+        # Download and stream-parse every due feed at once; results keep rss_urls order.
+        urls = self.rss_urls
+        if self.poll_scheduler:
+            urls = self.poll_scheduler.due(urls, now)
+            cutoffs = {
+                url: now - timedelta(hours=self.poll_scheduler.lookback_hours(url, hours, now))
+                for url in urls
+            }
+        else:
+            cutoffs = {url: now - timedelta(hours=hours) for url in urls}
+        headers = (
+            {url: self.feed_cache.conditional_headers(url, cutoffs[url]) for url in urls}
+            if self.feed_cache
+            else None
+        )
+        self.last_fetch_results = self.fetcher.fetch_all(
+            urls,
+            headers=headers,
+            parse=lambda url, chunks: parse_feed(chunks, cutoffs[url], self.max_entries),
+        )
+
+        for fetch_result in self.last_fetch_results:
+            cutoff_time = cutoffs[fetch_result.url]
+            feed_articles = self._load_feed_articles(fetch_result, cutoff_time)
+            if self.poll_scheduler and fetch_result.ok:
+                self.poll_scheduler.record(
+                    fetch_result.url, [a.published_at for a in feed_articles], now
+                )
+            for article in feed_articles:
+                if article.published_at >= cutoff_time and article.guid not in seen_guids:
+                    seen_guids.add(article.guid)
+                    articles.append(article)
 
         return articles
+
+    def _load_feed_articles(
+        self, fetch_result: FetchResult, cutoff_time: datetime
+    ) -> List[Article]:
+        """Articles stream-parsed during the download, or cached entries when it answered 304."""
+        if not fetch_result.ok:
+            return []
+
+        if fetch_result.not_modified and self.feed_cache:
+            cached = self.feed_cache.get(fetch_result.url)
+            return [Article(**entry) for entry in cached.entries] if cached else []
+
+        articles = [self._entry_to_article(entry) for entry in fetch_result.entries or []]
+
+        if self.feed_cache and (fetch_result.etag or fetch_result.last_modified):
+            self.feed_cache.put(
+                CachedFeed(
+                    url=fetch_result.url,
+                    etag=fetch_result.etag,
+                    last_modified=fetch_result.last_modified,
+                    entries=[a.model_dump(mode="json") for a in articles],
+                    parsed_since=cutoff_time,
+                )
+            )
+        return articles
+
+    @staticmethod
+    def _entry_to_article(entry: FeedEntry) -> Article:
+        return Article(
+            title=entry.title,
+            description=entry.description,
+            url=entry.link,
+            guid=entry.guid,
+            published_at=entry.published_at,
+            category=entry.category,
+        )
+
+    def get_fetch_latencies(self) -> dict:
+        """Per-feed download time (seconds) from the most recent get_articles call."""
+        return {r.url: round(r.elapsed, 3) for r in self.last_fetch_results}
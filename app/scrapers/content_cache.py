@@ -0,0 +1,151 @@
+"""Content-addressed on-disk cache for article HTML and its converted markdown."""
+
+import hashlib
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+from ..storage import state_path, hashed_name, read_json, write_json_atomic
+
+
+class CachedContent(BaseModel):
+    """Per-URL pointer to the blob key of the last response plus its validators."""
+
+    url: str
+    key: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def is_fresh(self, max_age: timedelta) -> bool:
+        return datetime.now(timezone.utc) - self.fetched_at < max_age
+
+
+class ContentCache:
+    """
+    Blobs are stored as `<key>.html` / `<key>.v<N>.md`, where the key hashes the URL
+    together with the response validator (ETag, Last-Modified, or a digest of
+    the body when the server sends neither). A small per-URL index maps a URL
+    to its current key. Total blob size is bounded with LRU eviction based on
+    file modification time, which is bumped on every read.
+    """
+
+    def __init__(self, max_bytes: int, namespace: str = "content", markdown_version: str = "1"):
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        # Bumped when the HTML -> markdown pipeline changes so stale
+        # conversions are re-derived from cached HTML instead of served.
+        self.markdown_suffix = f".v{markdown_version}.md"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, validator: str) -> str:
+        return hashlib.sha256(f"{url}\n{validator}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def body_digest(body: str) -> str:
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    def _index_path(self, url: str):
+        return state_path(self.namespace, "urls", hashed_name(url))
+
+    def _blob_path(self, key: str, suffix: str):
+        return state_path(self.namespace, "blobs", f"{key}{suffix}")
+
+    def lookup(self, url: str) -> Optional[CachedContent]:
+        data = read_json(self._index_path(url))
+        if not data:
+            return None
+        try:
+            return CachedContent(**data)
+        except ValueError:
+            return None
+
+    def conditional_headers(self, entry: Optional[CachedContent]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _read_blob(self, key: str, suffix: str) -> Optional[str]:
+        path = self._blob_path(key, suffix)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # mark as recently used for LRU eviction
+            return text
+        except OSError:
+            return None
+
+    def _write_blob(self, key: str, suffix: str, text: str) -> None:
+        path = self._blob_path(key, suffix)
+        tmp_path = path.with_name(f".tmp-{threading.get_ident()}-{path.name}")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    def get_html(self, key: str) -> Optional[str]:
+        return self._read_blob(key, ".html")
+
+    def get_markdown(self, key: str) -> Optional[str]:
+        return self._read_blob(key, self.markdown_suffix)
+
+    def put_markdown(self, key: str, markdown: str) -> None:
+        """Replace only the converted markdown for an already cached page."""
+        self._write_blob(key, self.markdown_suffix, markdown)
+
+    def put(
+        self,
+        url: str,
+        key: str,
+        html: str,
+        markdown: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store both representations and point the URL index at them."""
+        self._write_blob(key, ".html", html)
+        self._write_blob(key, self.markdown_suffix, markdown)
+        self.touch(url, key, etag, last_modified)
+        self.evict()
+
+    def touch(
+        self,
+        url: str,
+        key: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Record a (re)validated response for the URL without rewriting blobs."""
+        entry = CachedContent(url=url, key=key, etag=etag, last_modified=last_modified)
+        write_json_atomic(self._index_path(url), entry.model_dump(mode="json"))
+
+    def evict(self) -> int:
+        """Remove least recently used blobs until the cache fits max_bytes."""
+        blob_dir = state_path(self.namespace, "blobs", "_").parent
+        with self._lock:
+            files = []
+            for entry in os.scandir(blob_dir):
+                if entry.is_file() and not entry.name.startswith(".tmp-"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            removed = 0
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+            return removed
@@ -0,0 +1,166 @@
+"""Boilerplate stripping and main-content extraction for article HTML."""
+
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Subtrees that never carry article text.
+DROP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "aside", "form", "button", "select", "dialog",
+}
+# Page chrome when outside the article; kept inside it (e.g. the title block).
+CHROME_TAGS = {"header", "footer"}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "source", "track", "wbr",
+}
+KEPT_ATTRS = {"href", "src", "alt", "title"}
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog"}
+# Matched against whole class/id tokens, segment-wise ("social-share" yes,
+# "shared-notes" no). A token naming article content overrides the hint, so
+# containers like "post-content social-share-wrapper" keep their text.
+BOILERPLATE_HINTS = re.compile(
+    r"(?:^|[_-])(cookie|consent|newsletter|subscribe|social|share|breadcrumbs?|skip-link|promo)(?:$|[_-])",
+    re.IGNORECASE,
+)
+CONTENT_HINTS = re.compile(
+    r"(?:^|[_-])(article|content|post|entry|body|main|story|text)(?:$|[_-])",
+    re.IGNORECASE,
+)
+
+
+class _Element:
+    __slots__ = ("tag", "dropped", "candidate")
+
+    def __init__(self, tag: str, dropped: bool, candidate: Optional[dict] = None):
+        self.tag = tag
+        self.dropped = dropped
+        self.candidate = candidate
+
+
+class _ContentParser(HTMLParser):
+    """Re-serializes HTML without boilerplate and records article/main spans."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens: List[str] = []
+        self.stack: List[_Element] = []
+        self.candidates: List[dict] = []
+        self.drop_depth = 0
+        self.content_depth = 0
+        self.text_len = 0
+
+    def _is_boilerplate(self, tag: str, attrs: dict) -> bool:
+        if tag in DROP_TAGS:
+            return True
+        if tag in CHROME_TAGS and self.content_depth == 0:
+            return True
+        if attrs.get("role") in BOILERPLATE_ROLES or attrs.get("aria-hidden") == "true":
+            return True
+        tokens = f"{attrs.get('class') or ''} {attrs.get('id') or ''}".split()
+        return any(BOILERPLATE_HINTS.search(t) for t in tokens) and not any(
+            CONTENT_HINTS.search(t) for t in tokens
+        )
+
+    def _open_tag(self, tag: str, attrs: dict, self_closing: bool = False) -> str:
+        kept = "".join(
+            f' {name}="{escape(value, quote=True)}"'
+            for name, value in attrs.items()
+            if name in KEPT_ATTRS and value
+        )
+        return f"<{tag}{kept}{' /' if self_closing else ''}>"
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in VOID_TAGS:
+            if self.drop_depth == 0 and tag in {"br", "hr", "img"}:
+                self.tokens.append(self._open_tag(tag, attrs, self_closing=True))
+            return
+
+        if self.drop_depth or self._is_boilerplate(tag, attrs):
+            self.drop_depth += 1
+            self.stack.append(_Element(tag, dropped=True))
+            return
+
+        self.tokens.append(self._open_tag(tag, attrs))
+        candidate = None
+        if tag in ("article", "main") or attrs.get("role") == "main":
+            candidate = {
+                "kind": "article" if tag == "article" else "main",
+                "start": len(self.tokens),
+                "end": None,
+                "text_start": self.text_len,
+                "text": 0,
+            }
+            self.candidates.append(candidate)
+            self.content_depth += 1
+        self.stack.append(_Element(tag, dropped=False, candidate=candidate))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+        else:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if not any(element.tag == tag for element in self.stack):
+            return  # stray closing tag
+        while self.stack:
+            element = self.stack.pop()
+            self._close(element)
+            if element.tag == tag:
+                break
+
+    def _close(self, element: _Element) -> None:
+        if element.dropped:
+            self.drop_depth -= 1
+            return
+        if element.candidate is not None:
+            element.candidate["end"] = len(self.tokens)
+            element.candidate["text"] = self.text_len - element.candidate["text_start"]
+            self.content_depth -= 1
+        self.tokens.append(f"</{element.tag}>")
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        self.tokens.append(escape(data, quote=False))
+        self.text_len += len(data.strip())
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._close(self.stack.pop())
+
+
+def extract_main_content(html: str) -> str:
+    """
+    Return simplified HTML for the page's main content.
+
+    Scripts, styles, navigation, forms and similar chrome are removed, and
+    the largest <article> (else <main>/role=main) is selected when present;
+    otherwise the whole cleaned document is returned.
+    """
+    parser = _ContentParser()
+    parser.feed(html)
+    parser.close()
+
+    for kind in ("article", "main"):
+        spans = [c for c in parser.candidates if c["kind"] == kind and c["text"] > 0]
+        if spans:
+            best = max(spans, key=lambda c: c["text"])
+            return "".join(parser.tokens[best["start"]:best["end"]])
+    return "".join(parser.tokens)
+
+
+def truncate_markdown(markdown: str, max_chars: Optional[int]) -> str:
+    """Cap markdown length, cutting at the last paragraph break before the limit."""
+    if not max_chars or len(markdown) <= max_chars:
+        return markdown
+    cut = markdown.rfind("\n\n", 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars
+    return markdown[:cut].rstrip() + "\n"
@@ -0,0 +1,60 @@
+"""Persistent ETag/Last-Modified store with the last parsed entries per feed URL."""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from ..storage import state_path, hashed_name, read_json, write_json_atomic
+
+
+class CachedFeed(BaseModel):
+    """Validators and normalized entries from the last successful download."""
+
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    entries: List[dict] = Field(default_factory=list)
+    # Lookback cutoff used when parsing; None means every entry was kept.
+    parsed_since: Optional[datetime] = None
+    fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class FeedCache:
+    """One JSON file per URL so parallel fetches never contend on a shared file."""
+
+    def __init__(self, namespace: str = "feeds"):
+        self.namespace = namespace
+
+    def _path(self, url: str):
+        return state_path(self.namespace, hashed_name(url))
+
+    def get(self, url: str) -> Optional[CachedFeed]:
+        data = read_json(self._path(url))
+        if not data:
+            return None
+        try:
+            return CachedFeed(**data)
+        except ValueError:
+            return None
+
+    def put(self, feed: CachedFeed) -> None:
+        write_json_atomic(self._path(feed.url), feed.model_dump(mode="json"))
+
+    def conditional_headers(
+        self, url: str, cutoff_time: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """Request headers that let the server answer 304 when nothing changed.
+
+        Validators are only sent when the cached entries cover the requested
+        window, otherwise a 304 would hide entries older than the last parse.
+        """
+        cached = self.get(url)
+        if not cached:
+            return {}
+        if cached.parsed_since and (cutoff_time is None or cutoff_time < cached.parsed_since):
+            return {}
+        headers = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
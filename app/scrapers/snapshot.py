@@ -0,0 +1,81 @@
+"""Local index of entry IDs that earlier scrapes already persisted."""
+
+import hashlib
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, TypeVar
+from ..config import FEED_SNAPSHOT_RETENTION_DAYS
+from ..storage import state_path, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FeedSnapshot:
+    """
+    Seen-set for one source (RSS GUIDs or YouTube video IDs).
+
+    IDs are stored as 16-hex-digit SHA-1 prefixes mapped to the epoch second
+    they were last seen in a feed, so the file stays small however long the
+    GUIDs are. The file is local and knows nothing of the database, so IDs it
+    has seen are re-checked against the database before their items are
+    skipped: after a reset or a DATABASE_URL change they are persisted again
+    instead of being hidden. Entries confirmed present are refreshed; ones
+    absent for longer than the retention period are pruned on save. The
+    snapshot is not thread-safe: use it from the thread that persists items.
+    """
+
+    def __init__(self, name: str, retention_days: float = FEED_SNAPSHOT_RETENTION_DAYS):
+        self.path = state_path("snapshots", f"{name}.json")
+        self.retention_seconds = int(retention_days * 86400)
+        data = read_json(self.path)
+        self._seen: Dict[str, int] = data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _digest(entry_id: str) -> str:
+        return hashlib.sha1(entry_id.encode("utf-8")).hexdigest()[:16]
+
+    def filter_new(
+        self,
+        items: Iterable[T],
+        key: Callable[[T], str],
+        exists: Callable[[List[str]], Set[str]],
+    ) -> List[T]:
+        """
+        Return only items that are not persisted yet.
+
+        `exists` maps the IDs the snapshot has already seen to those the
+        database actually holds; only those items are dropped.
+        """
+        now = int(time.time())
+        items = list(items)
+        ids = [key(item) for item in items]
+        seen_ids = [entry_id for entry_id in ids if self._digest(entry_id) in self._seen]
+        persisted = exists(seen_ids) if seen_ids else set()
+        for entry_id in seen_ids:
+            digest = self._digest(entry_id)
+            if entry_id in persisted:
+                self._seen[digest] = now
+            else:
+                del self._seen[digest]
+        new_items = [item for item, entry_id in zip(items, ids) if entry_id not in persisted]
+        if len(seen_ids) > len(persisted):
+            logger.warning(
+                f"Snapshot {self.path.stem}: {len(seen_ids) - len(persisted)} seen entries "
+                "are missing from the database, persisting them again"
+            )
+        if persisted:
+            logger.info(f"Snapshot {self.path.stem}: {len(persisted)}/{len(items)} entries already persisted")
+        return new_items
+
+    def mark_seen(self, entry_ids: Iterable[str], now: Optional[int] = None) -> None:
+        """Record IDs once their items are safely persisted."""
+        now = now or int(time.time())
+        for entry_id in entry_ids:
+            self._seen[self._digest(entry_id)] = now
+
+    def save(self) -> None:
+        cutoff = int(time.time()) - self.retention_seconds
+        self._seen = {digest: seen for digest, seen in self._seen.items() if seen >= cutoff}
+        write_json_atomic(self.path, self._seen)
@@ -0,0 +1,222 @@
+"""Incremental RSS/Atom parsing that stops once entries fall outside the lookback window."""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, List, Optional, Union
+from xml.etree import ElementTree
+import feedparser
+from pydantic import BaseModel
+
+# In a newest-first feed, this many consecutive entries older than the cutoff
+# mean the rest of the document is older too.
+STALE_TOLERANCE = 3
+CHUNK_SIZE = 64 * 1024
+
+
+class FeedEntry(BaseModel):
+    """Source-agnostic view of one RSS item or Atom entry."""
+
+    guid: str
+    title: str
+    link: str
+    description: str
+    published_at: datetime
+    category: Optional[str] = None
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom) timestamps into aware UTC datetimes."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _text(element: Optional[ElementTree.Element]) -> str:
+    return (element.text or "").strip() if element is not None else ""
+
+
+def _rss_item_to_entry(item: ElementTree.Element) -> Optional[FeedEntry]:
+    children = {}
+    for child in item:
+        children.setdefault(_local(child.tag), child)
+
+    published_at = _parse_date(_text(children.get("pubDate")) or _text(children.get("date")))
+    if not published_at:
+        return None
+    link = _text(children.get("link"))
+    category = _text(children.get("category")) or None
+    return FeedEntry(
+        guid=_text(children.get("guid")) or link,
+        title=_text(children.get("title")),
+        link=link,
+        description=_text(children.get("description")),
+        published_at=published_at,
+        category=category,
+    )
+
+
+def _atom_entry_to_entry(entry: ElementTree.Element) -> Optional[FeedEntry]:
+    children = {}
+    link = ""
+    category = None
+    description = ""
+    for child in entry:
+        name = _local(child.tag)
+        if name == "link":
+            if not link or child.get("rel", "alternate") == "alternate":
+                link = child.get("href", link)
+        elif name == "category" and category is None:
+            category = child.get("term")
+        elif name == "group":
+            # YouTube nests the description under media:group.
+            for grandchild in child:
+                if _local(grandchild.tag) == "description":
+                    description = _text(grandchild)
+        else:
+            children.setdefault(name, child)
+
+    published_at = _parse_date(_text(children.get("published")) or _text(children.get("updated")))
+    if not published_at:
+        return None
+    return FeedEntry(
+        guid=_text(children.get("id")) or link,
+        title=_text(children.get("title")),
+        link=link,
+        description=_text(children.get("summary")) or _text(children.get("content")) or description,
+        published_at=published_at,
+        category=category,
+    )
+
+
+def _chunks(content: Union[bytes, Iterable[bytes]]) -> Iterator[bytes]:
+    """Iterate a feed body given either as bytes or as downloaded chunks."""
+    if isinstance(content, (bytes, bytearray)):
+        return (content[offset:offset + CHUNK_SIZE] for offset in range(0, len(content), CHUNK_SIZE))
+    return iter(content)
+
+
+def iter_feed_entries(
+    content: Union[bytes, Iterable[bytes]],
+    cutoff_time: Optional[datetime] = None,
+    max_entries: Optional[int] = None,
+    stale_tolerance: int = STALE_TOLERANCE,
+) -> Iterator[FeedEntry]:
+    """
+    Yield entries one at a time while the document is still being parsed.
+
+    `content` is the whole body or an iterator of chunks as they arrive
+    (e.g. Response.iter_content), so a caller that stops iterating also
+    stops the download. Parsing stops after `max_entries` entries, or once
+    `stale_tolerance` consecutive entries are older than `cutoff_time` in a
+    feed seen to be newest-first (published times decreasing, never
+    increasing); other feeds are parsed to the end so no fresh entry is
+    missed. Raises ElementTree.ParseError on malformed XML.
+    """
+    parser = ElementTree.XMLPullParser(events=("end",))
+    yielded = 0
+    stale = 0
+    previous: Optional[datetime] = None
+    descending = False
+    unordered = False
+
+    for chunk in _chunks(content):
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            name = _local(element.tag)
+            if name == "item":
+                entry = _rss_item_to_entry(element)
+            elif name == "entry":
+                entry = _atom_entry_to_entry(element)
+            else:
+                continue
+            # Drop the parsed subtree so memory stays flat on large feeds.
+            element.clear()
+            if entry is None:
+                continue
+
+            if previous is not None:
+                if entry.published_at < previous:
+                    descending = True
+                elif entry.published_at > previous:
+                    unordered = True
+            previous = entry.published_at
+
+            if cutoff_time and entry.published_at < cutoff_time:
+                stale += 1
+                if descending and not unordered and stale >= stale_tolerance:
+                    return
+                continue
+
+            stale = 0
+            yield entry
+            yielded += 1
+            if max_entries and yielded >= max_entries:
+                return
+
+    parser.close()
+
+
+def _feedparser_entries(
+    content: bytes, cutoff_time: Optional[datetime], max_entries: Optional[int]
+) -> List[FeedEntry]:
+    """Tolerant fallback for documents the strict XML parser rejects."""
+    entries = []
+    for entry in feedparser.parse(content).entries:
+        published_parsed = getattr(entry, "published_parsed", None)
+        if not published_parsed:
+            continue
+        published_at = datetime(*published_parsed[:6], tzinfo=timezone.utc)
+        if cutoff_time and published_at < cutoff_time:
+            continue
+        entries.append(
+            FeedEntry(
+                guid=entry.get("id", entry.get("link", "")),
+                title=entry.get("title", ""),
+                link=entry.get("link", ""),
+                description=entry.get("description", entry.get("summary", "")),
+                published_at=published_at,
+                category=entry.get("tags", [{}])[0].get("term")
+                if entry.get("tags")
+                else None,
+            )
+        )
+        if max_entries and len(entries) >= max_entries:
+            break
+    return entries
+
+
+def parse_feed(
+    content: Union[bytes, Iterable[bytes]],
+    cutoff_time: Optional[datetime] = None,
+    max_entries: Optional[int] = None,
+) -> List[FeedEntry]:
+    """Stream-parse a feed (bytes or chunks), falling back to feedparser for malformed XML."""
+    chunks = _chunks(content)
+    # Only what has been read so far is kept, for the fallback below.
+    received: List[bytes] = []
+
+    def recorded() -> Iterator[bytes]:
+        for chunk in chunks:
+            received.append(chunk)
+            yield chunk
+
+    try:
+        return list(iter_feed_entries(recorded(), cutoff_time, max_entries))
+    except ElementTree.ParseError:
+        # feedparser needs the whole document: read the rest of it.
+        return _feedparser_entries(b"".join(received) + b"".join(chunks), cutoff_time, max_entries)
@@ -1,13 +1,32 @@
 """YouTube channel scraper + transcript fetcher."""
 
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
-import os
-import feedparser
+from typing import Dict, List, Optional
+import requests
 from pydantic import BaseModel
 from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
-from youtube_transcript_api.proxies import WebshareProxyConfig
+from youtube_transcript_api._errors import (
+    CouldNotRetrieveTranscript,
+    TranscriptsDisabled,
+    NoTranscriptFound,
+    RequestBlocked,
+    YouTubeRequestFailed,
+)
+from ..config import (
+    FEED_FETCH_TIMEOUT,
+    FEED_CACHE_ENABLED,
+    FEED_MAX_ENTRIES,
+    YOUTUBE_SCRAPE_WORKERS,
+    YOUTUBE_FEED_RATE_PER_HOST,
+)
+from ..http_client import new_http_session
+from .fetch import FeedFetcher
+from .rate_limit import HostRateLimiter
+from .proxy_pool import ProxyPool, ProxyEndpoint, ProxyPoolExhausted
+from .stream_parser import parse_feed
+from .feed_cache import FeedCache, CachedFeed
 
 
 class Transcript(BaseModel):
@@ -28,17 +47,20 @@ class ChannelVideo(BaseModel):
 
 
 class YouTubeScraper:
-    def __init__(self):
-        proxy_config = None
-        proxy_username = os.getenv("WEBSHARE_USERNAME")
-        proxy_password = os.getenv("WEBSHARE_PASSWORD")
-
-        if proxy_username and proxy_password:
-            proxy_config = WebshareProxyConfig(
-                proxy_username=proxy_username, proxy_password=proxy_password
-            )
-
-        self.transcript_api = YouTubeTranscriptApi(proxy_config=proxy_config)
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None):
+        # Transcript requests are spread over every configured proxy; with no
+        # proxies they go out directly.
+        self.proxy_pool = proxy_pool if proxy_pool is not None else ProxyPool.from_env()
+        # Transcript clients are created per thread (see _transcript_api).
+        self._local = threading.local()
+        # Channel feeds are fetched from many threads at once; all of them hit
+        # the same host, so throttle per host to stay under YouTube's limits.
+        self.fetcher = FeedFetcher(
+            timeout=FEED_FETCH_TIMEOUT,
+            max_workers=YOUTUBE_SCRAPE_WORKERS,
+            rate_limiter=HostRateLimiter(YOUTUBE_FEED_RATE_PER_HOST),
+        )
+        self.feed_cache = FeedCache() if FEED_CACHE_ENABLED else None
 
     def _get_rss_url(self, channel_id: str) -> str:
         return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
@@ -52,40 +74,141 @@ class YouTubeScraper:
             return video_url.split("youtu.be/")[1].split("?")[0]
         return video_url
 
-    def get_transcript(self, video_id: str) -> Optional[Transcript]:
+    def fetch_transcript(self, video_id: str) -> Optional[Transcript]:
+        """Fetch a transcript; None if the video has none, other errors propagate.
+
+        The request goes through a proxy picked from the pool, and the outcome
+        is reported back so throttled or dead proxies are cooled down. Raises
+        ProxyPoolExhausted (retryable) while every proxy is cooling down.
+        """
+        endpoint = self.proxy_pool.acquire()
+        if endpoint is None and len(self.proxy_pool):
+            raise ProxyPoolExhausted(self.proxy_pool.next_available_in())
+        api = self._transcript_api(endpoint)
+        start = time.perf_counter()
         try:
-            transcript = self.transcript_api.fetch(video_id)
-            text = " ".join([snippet.text for snippet in transcript.snippets])
-            return Transcript(text=text)
+            transcript = api.fetch(video_id)
         except (TranscriptsDisabled, NoTranscriptFound):
+            self._report_proxy(endpoint, start)
             return None
+        except Exception as e:
+            self._report_proxy(endpoint, start, error=e)
+            raise
+        self._report_proxy(endpoint, start)
+        text = " ".join([snippet.text for snippet in transcript.snippets])
+        return Transcript(text=text)
+
+    def _transcript_api(self, endpoint: Optional[ProxyEndpoint]) -> YouTubeTranscriptApi:
+        """
+        This thread's client for `endpoint` (None: direct). YouTubeTranscriptApi
+        is not thread-safe and sets cookies on its session while fetching, so
+        every thread gets its own clients, each on its own session.
+        """
+        apis: Optional[Dict[Optional[str], YouTubeTranscriptApi]] = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = {}
+        key = endpoint.key if endpoint else None
+        if key not in apis:
+            apis[key] = YouTubeTranscriptApi(
+                proxy_config=endpoint.proxy_config if endpoint else None,
+                http_client=new_http_session(),
+            )
+        return apis[key]
+
+    def _report_proxy(
+        self, endpoint: Optional[ProxyEndpoint], start: float, error: Optional[Exception] = None
+    ) -> None:
+        if endpoint is None:
+            return
+        if error is None or self.is_video_error(error):
+            # YouTube answered through the proxy; the video just has no transcript.
+            self.proxy_pool.report_success(endpoint, time.perf_counter() - start)
+        elif self.is_retryable_error(error):
+            # Throttled, IP-banned or unreachable (ProxyError is a ConnectionError).
+            self.proxy_pool.report_failure(endpoint, blocked=True)
+        elif isinstance(error, (requests.RequestException, YouTubeRequestFailed)):
+            self.proxy_pool.report_failure(endpoint)
+        # Anything else (e.g. a parsing bug) says nothing about the proxy.
+
+    def get_transcript(self, video_id: str) -> Optional[Transcript]:
+        try:
+            return self.fetch_transcript(video_id)
         except Exception:
             return None
 
+    @staticmethod
+    def is_throttling_error(error: Exception) -> bool:
+        """True for errors that mean "slow down" rather than "no transcript"."""
+        if isinstance(error, RequestBlocked):
+            return True
+        if isinstance(error, YouTubeRequestFailed):
+            return "429" in str(error) or "Too Many Requests" in str(error)
+        return False
+
+    @staticmethod
+    def is_video_error(error: Exception) -> bool:
+        """Video-level outcomes (unavailable, captions disabled, age-restricted...)."""
+        return isinstance(error, CouldNotRetrieveTranscript) and not isinstance(
+            error, (RequestBlocked, YouTubeRequestFailed)
+        )
+
+    @classmethod
+    def is_retryable_error(cls, error: Exception) -> bool:
+        """Throttling, an unreachable proxy or no proxy ready: another attempt may well succeed."""
+        return cls.is_throttling_error(error) or isinstance(
+            error, (requests.ConnectionError, ProxyPoolExhausted)
+        )
+
     def get_latest_videos(self, channel_id: str, hours: int = 24) -> list[ChannelVideo]:
-        feed = feedparser.parse(self._get_rss_url(channel_id))
-        if not feed.entries:
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        return [
+            video
+            for video in self._load_channel_videos(channel_id, cutoff_time)
+            if video.published_at >= cutoff_time
+        ]
+
+    def _load_channel_videos(self, channel_id: str, cutoff_time: datetime) -> list[ChannelVideo]:
+        """Stream-parse the channel feed, reusing cached videos when it answers 304."""
+        rss_url = self._get_rss_url(channel_id)
+        headers = (
+            self.feed_cache.conditional_headers(rss_url, cutoff_time)
+            if self.feed_cache
+            else None
+        )
+        fetch_result = self.fetcher.fetch(
+            rss_url,
+            headers=headers,
+            parse=lambda url, chunks: parse_feed(chunks, cutoff_time, FEED_MAX_ENTRIES),
+        )
+        if not fetch_result.ok:
             return []
 
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-        videos = []
-
-        for entry in feed.entries:
-            if "/shorts/" in entry.link:
-                continue
-            published_time = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-            if published_time >= cutoff_time:
-                video_id = self._extract_video_id(entry.link)
-                videos.append(
-                    ChannelVideo(
-                        title=entry.title,
-                        url=entry.link,
-                        video_id=video_id,
-                        published_at=published_time,
-                        description=entry.get("summary", ""),
-                    )
+        if fetch_result.not_modified and self.feed_cache:
+            cached = self.feed_cache.get(rss_url)
+            return [ChannelVideo(**entry) for entry in cached.entries] if cached else []
+
+        videos = [
+            ChannelVideo(
+                title=entry.title,
+                url=entry.link,
+                video_id=self._extract_video_id(entry.link),
+                published_at=entry.published_at,
+                description=entry.description,
+            )
+            for entry in fetch_result.entries or []
+            if "/shorts/" not in entry.link
+        ]
+
+        if self.feed_cache and (fetch_result.etag or fetch_result.last_modified):
+            self.feed_cache.put(
+                CachedFeed(
+                    url=rss_url,
+                    etag=fetch_result.etag,
+                    last_modified=fetch_result.last_modified,
+                    entries=[v.model_dump(mode="json") for v in videos],
+                    parsed_since=cutoff_time,
                 )
-
+            )
         return videos
 
     def scrape_channel(self, channel_id: str, hours: int = 150) -> list[ChannelVideo]:
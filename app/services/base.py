@@ -1,7 +1,9 @@
 """Abstract base for services that transform and persist content items."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterator, Tuple
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +12,9 @@ logger = logging.getLogger(__name__)
 class BaseProcessService(ABC):
     """Template method pattern: fetch -> process -> save with logging."""
 
+    # Items processed in parallel; subclasses opt in by raising this.
+    max_workers: int = 1
+
     def __init__(self):
         self.logger = logger
 
@@ -24,30 +29,39 @@ class BaseProcessService(ABC):
         pass
 
     @abstractmethod
-    def save_result(self, item: Any, result: Any) -> bool:
-        """Persist the processed output back to storage."""
+    def save_result(self, item: Any, result: Any) -> Optional[bool]:
+        """Persist the processed output back to storage.
+
+        Returns True when stored, False on failure, or None when the item was
+        deliberately left for a later run (counted as skipped).
+        """
         pass
 
     def process(self, limit: Optional[int] = None) -> Dict[str, Any]:
-        """Process a batch of items end-to-end with success/failure counts."""
+        """Process a batch of items end-to-end with success/failure counts.
+
+        With max_workers > 1, process_item runs on a thread pool while
+        save_result and the counters stay on the calling thread, so storage
+        sessions are never shared across threads. Items handed to workers must
+        therefore not lazy-load from a session (return plain values instead).
+        """
         items = self.get_items_to_process(limit=limit)
         total = len(items)
         processed = 0
         failed = 0
+        skipped = 0
 
         self.logger.info(f"Starting processing for {total} items")
 
-        for idx, item in enumerate(items, 1):
+        for item, get_result in self._iter_results(items):
             item_id = self._get_item_id(item)
-            item_title = self._get_item_title(item)
-            display_title = item_title[:60] + "..." if len(item_title) > 60 else item_title
-
-            self.logger.info(f"[{idx}/{total}] Processing {display_title} (ID: {item_id})")
-
             try:
-                result = self.process_item(item)
+                result = get_result()
                 if result:
-                    if self.save_result(item, result):
+                    saved = self.save_result(item, result)
+                    if saved is None:
+                        skipped += 1
+                    elif saved:
                         processed += 1
                         self.logger.info(f"✓ Successfully processed {item_id}")
                     else:
@@ -60,14 +74,42 @@ class BaseProcessService(ABC):
                 failed += 1
                 self.logger.error(f"✗ Error processing {item_id}: {e}")
 
-        self.logger.info(f"Processing complete: {processed} processed, {failed} failed out of {total} total")
+        self.logger.info(
+            f"Processing complete: {processed} processed, {failed} failed, "
+            f"{skipped} skipped out of {total} total"
+        )
 
         return {
             "total": total,
             "processed": processed,
-            "failed": failed
+            "failed": failed,
+            "skipped": skipped,
         }
 
+    def _iter_results(self, items: list) -> Iterator[Tuple[Any, Callable[[], Any]]]:
+        """Yield (item, result getter) pairs, in completion order when concurrent."""
+        total = len(items)
+        if self.max_workers <= 1 or total <= 1:
+            for idx, item in enumerate(items, 1):
+                yield item, partial(self._process_logged, idx, total, item)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+            future_to_item = {
+                executor.submit(self._process_logged, idx, total, item): item
+                for idx, item in enumerate(items, 1)
+            }
+            for future in as_completed(future_to_item):
+                yield future_to_item[future], future.result
+
+    def _process_logged(self, idx: int, total: int, item: Any) -> Optional[Any]:
+        item_id = self._get_item_id(item)
+        item_title = self._get_item_title(item)
+        display_title = item_title[:60] + "..." if len(item_title) > 60 else item_title
+
+        self.logger.info(f"[{idx}/{total}] Processing {display_title} (ID: {item_id})")
+        return self.process_item(item)
+
     def _get_item_id(self, item: Any) -> str:
         """Best-effort identifier used for logging context."""
         if hasattr(item, "id"):
@@ -60,15 +60,23 @@ def generate_email_digest_for_user(
     user_profile: Dict[str, Any],
     channel_ids: list,
     hours: int = 24,
-    top_n: int = 10
+    top_n: int = 10,
+    repo: Optional[Repository] = None,
 ) -> EmailDigestResponse:
     """Produce the ranked digest payload for a specific user."""
+    if repo is None:
+        with Repository.session_scope() as repo:
+            return generate_email_digest_for_user(
+                user_id, user_profile, channel_ids, hours=hours, top_n=top_n, repo=repo
+            )
+
     curator = CuratorAgent(user_profile)
     email_agent = EmailAgent(user_profile)
-    repo = Repository()
 
     # Get user-specific digests (filtered by channels)
     digests = repo.get_recent_digests_for_user(user_id, channel_ids, hours=hours)
+    # End the read transaction so the connection is not held during LLM calls.
+    repo.session.commit()
     total = len(digests)
 
     if total == 0:
@@ -112,7 +120,9 @@ def send_digest_email_for_user(
     user_profile: Dict[str, Any],
     channel_ids: list,
     hours: int = 24,
-    top_n: int = 10
+    top_n: int = 10,
+    mark_sent: bool = True,
+    repo: Optional[Repository] = None,
 ) -> dict:
     """
     Fetch digests for user, rank them, render email, and send it.
@@ -122,8 +132,20 @@ def send_digest_email_for_user(
     2. Signup email (default - from users collection)
     
     MY_EMAIL from .env is used as the sender (SMTP credentials).
+
+    With mark_sent=False the sent digest IDs are returned in "digest_ids"
+    instead of being recorded, so a batch caller can record every user's
+    sends in one statement (Repository.mark_digests_as_sent_for_users).
+
+    Database work uses `repo` if given (e.g. one scope per pipeline worker),
+    otherwise a session scoped to this call.
     """
-    repo = Repository()
+    if repo is None:
+        with Repository.session_scope() as repo:
+            return send_digest_email_for_user(
+                user_id, user_profile, channel_ids,
+                hours=hours, top_n=top_n, mark_sent=mark_sent, repo=repo,
+            )
     
     # Get recipient email: prefer email_to from profile, fallback to signup email
     recipient_email = None
@@ -148,7 +170,7 @@ def send_digest_email_for_user(
 
     try:
         result = generate_email_digest_for_user(
-            user_id, user_profile, channel_ids, hours=hours, top_n=top_n
+            user_id, user_profile, channel_ids, hours=hours, top_n=top_n, repo=repo
         )
         markdown_content = result.to_markdown()
         html_content = digest_to_html(result)
@@ -163,14 +185,18 @@ def send_digest_email_for_user(
         )
 
         digest_ids = [article.digest_id for article in result.articles]
-        marked_count = repo.mark_digests_as_sent_for_user(user_id, digest_ids)
-
-        logger.info(f"Email sent successfully to {recipient_email}! Marked {marked_count} digests as sent for user {user_id}.")
+        if mark_sent:
+            marked_count = repo.mark_digests_as_sent_for_user(user_id, digest_ids)
+            logger.info(f"Email sent successfully to {recipient_email}! Marked {marked_count} digests as sent for user {user_id}.")
+        else:
+            marked_count = 0
+            logger.info(f"Email sent successfully to {recipient_email}!")
         return {
             "success": True,
             "subject": subject,
             "articles_count": len(result.articles),
             "marked_as_sent": marked_count,
+            "digest_ids": digest_ids,
             "user_id": user_id,
             "email": recipient_email,
         }
@@ -186,8 +212,8 @@ def send_digest_email_for_user(
 def send_digest_email(hours: int = 24, top_n: int = 10) -> dict:
     """Legacy function - kept for backward compatibility."""
     logger.warning("Using legacy send_digest_email function. Use send_digest_email_for_user instead.")
-    repo = Repository()
-    digests = repo.get_recent_digests(hours=hours)
+    with Repository.session_scope() as repo:
+        digests = repo.get_recent_digests(hours=hours)
 
     if len(digests) == 0:
         logger.info("No new digests to send. Nothing to send.")
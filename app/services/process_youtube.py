@@ -1,7 +1,23 @@
 """Service that fetches YouTube transcripts and stores them."""
 
-from typing import Optional
+import random
+import time
+from datetime import timedelta
+from typing import Optional, Union
+from pydantic import BaseModel
+from app.config import (
+    TRANSCRIPT_WORKERS,
+    TRANSCRIPT_RATE_PER_SECOND,
+    TRANSCRIPT_MAX_RETRIES,
+    TRANSCRIPT_BACKOFF_BASE,
+    TRANSCRIPT_BACKOFF_MAX,
+    TRANSCRIPT_RETRY_BASE_HOURS,
+    TRANSCRIPT_RETRY_MAX_HOURS,
+    TRANSCRIPT_RETRY_MAX_ATTEMPTS,
+)
 from app.scrapers.youtube import YouTubeScraper
+from app.scrapers.proxy_pool import ProxyPoolExhausted
+from app.scrapers.rate_limit import TokenBucket
 from app.database.repository import Repository
 from .base import BaseProcessService
 
@@ -9,36 +25,105 @@ from .base import BaseProcessService
 TRANSCRIPT_UNAVAILABLE_MARKER = "__UNAVAILABLE__"
 
 
+class PendingVideo(BaseModel):
+    """Detached copy of a video row so worker threads never touch the session."""
+
+    video_id: str
+    title: str
+
+
+class TranscriptFailure(BaseModel):
+    """A fetch that produced no transcript; recorded in the negative cache."""
+
+    error: str
+
+
 class YouTubeTranscriptProcessor(BaseProcessService):
-    def __init__(self):
+    def __init__(self, max_workers: int = TRANSCRIPT_WORKERS):
         super().__init__()
         self.scraper = YouTubeScraper()
         self.repo = Repository()
         self.unavailable = 0
+        self.retry_scheduled = 0
+        self.max_workers = max_workers
+        # Shared by all workers so the total request rate stays bounded.
+        self.rate_limiter = TokenBucket(TRANSCRIPT_RATE_PER_SECOND)
 
     def get_items_to_process(self, limit: Optional[int] = None) -> list:
-        """Fetch videos missing transcripts."""
-        return self.repo.get_youtube_videos_without_transcript(limit=limit)
-
-    def process_item(self, item) -> Optional[str]:
-        """Pull transcript via YouTubeTranscriptApi, mark as unavailable if missing."""
-        try:
-            transcript_result = self.scraper.get_transcript(item.video_id)
-            return transcript_result.text if transcript_result else TRANSCRIPT_UNAVAILABLE_MARKER
-        except Exception:
-            return TRANSCRIPT_UNAVAILABLE_MARKER
-
-    def save_result(self, item, result: str) -> bool:
-        """Persist transcript text (or unavailable marker) on the video record."""
+        """Fetch videos missing transcripts that are not backing off after a failure."""
+        videos = self.repo.get_youtube_videos_without_transcript(limit=limit)
+        return [PendingVideo(video_id=v.video_id, title=v.title) for v in videos]
+
+    def process_item(self, item) -> Optional[Union[str, TranscriptFailure]]:
+        """Pull transcript via YouTubeTranscriptApi, or describe why there is none.
+
+        Throttling, proxy connection errors and an exhausted proxy pool are
+        retried with jittered exponential backoff (the pool routes retries to
+        other proxies, or the wait covers the shortest cooldown); if they
+        persist the item is left untouched (None) so a later run retries it.
+        """
+        for attempt in range(TRANSCRIPT_MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                transcript_result = self.scraper.fetch_transcript(item.video_id)
+                if transcript_result:
+                    return transcript_result.text
+                # Captions are often published hours after the upload.
+                return TranscriptFailure(error="NoTranscriptAvailable")
+            except Exception as e:
+                if not self.scraper.is_retryable_error(e):
+                    return TranscriptFailure(error=type(e).__name__)
+                if attempt == TRANSCRIPT_MAX_RETRIES:
+                    self.logger.warning(f"Throttled fetching transcript for {item.video_id}, giving up for this run")
+                    return None
+                # Full jitter keeps concurrent workers from retrying in lockstep.
+                delay = random.uniform(
+                    0, min(TRANSCRIPT_BACKOFF_MAX, TRANSCRIPT_BACKOFF_BASE * 2 ** attempt)
+                )
+                if isinstance(e, ProxyPoolExhausted):
+                    # No point retrying before the first proxy leaves its cooldown.
+                    delay = max(delay, min(TRANSCRIPT_BACKOFF_MAX, e.retry_after))
+                self.logger.info(f"Throttled on {item.video_id}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+        return None
+
+    def save_result(self, item, result: Union[str, TranscriptFailure]) -> Optional[bool]:
+        """Persist transcript text, or schedule a retry for a failed fetch.
+
+        A scheduled retry returns None, so it is counted in retry_scheduled
+        rather than processed. After TRANSCRIPT_RETRY_MAX_ATTEMPTS failures
+        the video is marked unavailable so it is never requested again.
+        """
+        if isinstance(result, TranscriptFailure):
+            attempt = self.repo.record_transcript_failure(
+                item.video_id,
+                result.error,
+                base_delay=timedelta(hours=TRANSCRIPT_RETRY_BASE_HOURS),
+                max_delay=timedelta(hours=TRANSCRIPT_RETRY_MAX_HOURS),
+            )
+            if attempt.attempts < TRANSCRIPT_RETRY_MAX_ATTEMPTS:
+                self.retry_scheduled += 1
+                self.logger.info(
+                    f"No transcript for {item.video_id} ({result.error}), "
+                    f"attempt {attempt.attempts}, retrying after {attempt.next_retry_at:%Y-%m-%d %H:%M}"
+                )
+                return None
+            result = TRANSCRIPT_UNAVAILABLE_MARKER
+
         success = self.repo.update_youtube_video_transcript(item.video_id, result)
         if result == TRANSCRIPT_UNAVAILABLE_MARKER:
             self.unavailable += 1
         return success
 
     def process(self, limit: Optional[int] = None) -> dict:
-        """Extend base processing to also report unavailable count."""
+        """Extend base processing to also report unavailable and retry counts."""
+        self.unavailable = 0
+        self.retry_scheduled = 0
         result = super().process(limit=limit)
         result["unavailable"] = self.unavailable
+        result["retry_scheduled"] = self.retry_scheduled
+        for proxy_stats in self.scraper.proxy_pool.stats():
+            self.logger.info(f"Proxy health: {proxy_stats}")
         return result
 
 
@@ -53,5 +138,5 @@ if __name__ == "__main__":
     print(f"Total videos: {result['total']}")
     print(f"Processed: {result['processed']}")
     print(f"Unavailable: {result['unavailable']}")
+    print(f"Retry scheduled: {result['retry_scheduled']}")
     print(f"Failed: {result['failed']}")
-
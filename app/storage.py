@@ -0,0 +1,44 @@
+"""Helpers for the local state directory shared by caches and indexes."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+from .config import CACHE_DIR
+
+
+def state_path(*parts: str) -> Path:
+    """Return a path under CACHE_DIR, creating parent directories on demand."""
+    path = Path(CACHE_DIR).joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def hashed_name(key: str, suffix: str = ".json") -> str:
+    """Stable filesystem-safe name for an arbitrary key such as a URL."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest() + suffix
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """Load JSON from disk; missing or corrupt files read as None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via temp file + rename so concurrent readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise